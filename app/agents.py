@@ -1,10 +1,96 @@
 # app/agents.py
+import asyncio
+import atexit
 import json
 import os
+import queue
+import re
+import threading
 import time
 import hashlib
-from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from .llm import MockLLM
+
+# Optional C-backed JSON encoder for audit records
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional fast non-cryptographic hash for context fingerprints
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Recorded next to each context_hash so readers know how it was computed
+CONTEXT_HASH_ALGO = "xxh3_64" if xxhash is not None else "blake2b-64"
+
+# Heuristic fact-check tokenizers, compiled once at import
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
+
+# Sentinel that tells the audit writer thread to exit
+_STOP = object()
+
+
+@lru_cache(maxsize=512)
+def _ctx_hash(context: str) -> str:
+    """64-bit hex fingerprint of a context string (CONTEXT_HASH_ALGO; not for
+    security); repeated contexts hit the cache."""
+    data = context.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+# Returned when the verifier LLM fails or its output cannot be parsed
+_VERIFY_FALLBACK = {"verdict": "WARN", "unsupported_claims": [], "confidence": 0.5, "notes": "LLM verify fallback."}
+
+
+def _extract_json_span(s: str) -> Tuple[int, int]:
+    """(start, end) of the first balanced `{...}` in `s`, or (-1, -1).
+
+    One pass tracking brace depth; braces inside string literals (with
+    backslash escapes) do not count.
+    """
+    depth, start = 0, -1
+    in_string = escaped = False
+    for i, ch in enumerate(s):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = depth > 0
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+    return -1, -1
+
+
+def _json_line(payload: Dict[str, Any]) -> bytes:
+    """Encode one JSONL record as UTF-8 bytes (orjson when installed).
+
+    orjson rejects some values stdlib json accepts (e.g. ints wider than
+    64 bits, which LLM verdicts can carry); those records use json.dumps.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
 
 class FactCheckAgent:
     """
@@ -20,11 +106,17 @@ class FactCheckAgent:
         "notes": str
       }
     """
+    _VERIFY_SYSTEM = "Be strict, concise, and only judge based on the context. Output JSON only."
+
     def __init__(self, llm_client):
         self.llm = llm_client
+        # Resolve the strategy once instead of sniffing the class name per call
+        self._is_mock = isinstance(llm_client, MockLLM) or "mock" in type(llm_client).__name__.lower()
+        self._verify = self._heuristic_check if self._is_mock else self._llm_verify
 
-    def _llm_verify(self, question: str, answer: str, context: str) -> Dict[str, Any]:
-        prompt = f"""
+    @staticmethod
+    def _verify_prompt(question: str, answer: str, context: str) -> str:
+        return f"""
 You are a rigorous fact-checker.
 
 Task: Given the user question, an assistant's answer, and the exact context snippets used (from a news dataset), identify any specific claims in the answer that are NOT explicitly supported by the provided context.
@@ -44,43 +136,96 @@ ANSWER:
 CONTEXT:
 {context}
 """
+
+    @staticmethod
+    def _normalize_verdict(parsed: Dict[str, Any]) -> Dict[str, Any]:
+        verdict = parsed.get("verdict", "WARN")
+        uc = parsed.get("unsupported_claims") or []
+        if not isinstance(uc, list): uc = [str(uc)]
+        conf = float(parsed.get("confidence", 0.6))
+        notes = parsed.get("notes", "")
+        return {"verdict": verdict, "unsupported_claims": uc, "confidence": conf, "notes": notes}
+
+    @staticmethod
+    def _parse_verdict(raw: str) -> Dict[str, Any]:
         try:
-            raw = self.llm.complete(prompt, system="Be strict, concise, and only judge based on the context. Output JSON only.")
             # Try to parse JSON; if the model returned plain text, wrap minimally
             parsed = None
             try:
                 parsed = json.loads(raw)
             except Exception:
-                # Best-effort extraction: look for JSON braces
-                start = raw.find("{")
-                end = raw.rfind("}")
-                if start != -1 and end != -1 and end > start:
-                    parsed = json.loads(raw[start:end+1])
+                # Best-effort extraction: first balanced JSON object
+                start, end = _extract_json_span(raw)
+                if start != -1:
+                    parsed = json.loads(raw[start:end])
             if isinstance(parsed, dict):
-                # normalization
-                verdict = parsed.get("verdict", "WARN")
-                uc = parsed.get("unsupported_claims") or []
-                if not isinstance(uc, list): uc = [str(uc)]
-                conf = float(parsed.get("confidence", 0.6))
-                notes = parsed.get("notes", "")
-                return {"verdict": verdict, "unsupported_claims": uc, "confidence": conf, "notes": notes}
+                return FactCheckAgent._normalize_verdict(parsed)
         except Exception:
             pass
         # fallthrough
-        return {"verdict": "WARN", "unsupported_claims": [], "confidence": 0.5, "notes": "LLM verify fallback."}
+        return _VERIFY_FALLBACK.copy()
+
+    @staticmethod
+    def split_combined(raw: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Split a combined `{"answer": ..., "fact_check": {...}}` reply.
+
+        Returns (answer, fact_check). fact_check is None when missing or
+        malformed (the caller then verifies separately); a reply that is not
+        JSON is returned whole as the answer. A JSON object without a string
+        "answer" gives (None, None) so the caller asks again without JSON mode
+        rather than showing raw JSON to the user.
+        """
+        try:
+            parsed = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception:
+            return raw, None
+        if not isinstance(parsed, dict):
+            return raw, None
+        if not isinstance(parsed.get("answer"), str):
+            return None, None
+        fc = parsed.get("fact_check")
+        try:
+            fc = FactCheckAgent._normalize_verdict(fc) if isinstance(fc, dict) else None
+        except (TypeError, ValueError):
+            fc = None
+        return parsed["answer"].strip(), fc
+
+    def _llm_verify(self, question: str, answer: str, context: str) -> Dict[str, Any]:
+        try:
+            raw = self.llm.complete(self._verify_prompt(question, answer, context), system=self._VERIFY_SYSTEM)
+        except Exception:
+            return _VERIFY_FALLBACK.copy()
+        return self._parse_verdict(raw)
+
+    async def _allm_verify(self, question: str, answer: str, context: str) -> Dict[str, Any]:
+        prompt = self._verify_prompt(question, answer, context)
+        try:
+            acomplete = getattr(self.llm, "acomplete", None)
+            if acomplete is not None:
+                raw = await acomplete(prompt, system=self._VERIFY_SYSTEM)
+            else:
+                raw = await asyncio.to_thread(self.llm.complete, prompt, system=self._VERIFY_SYSTEM)
+        except Exception:
+            return _VERIFY_FALLBACK.copy()
+        return self._parse_verdict(raw)
 
     def _heuristic_verify(self, answer: str, context: str) -> Dict[str, Any]:
         # Very light check: sentences with very low token overlap are flagged.
-        import re
-        sent_split = re.split(r'(?<=[.!?])\s+', (answer or "").strip())
-        ctx = (context or "").lower()
+        answer = (answer or "").strip()
+        sent_split = _SENT_SPLIT_RE.split(answer)
+        # Lower-case the answer once; case folding never touches the split
+        # points, so lowered sentences line up with the originals (kept for
+        # reporting unsupported claims).
+        sent_lower = _SENT_SPLIT_RE.split(answer.lower())
+        # Tokenize the context once; per-token checks become set lookups
+        ctx_tokens = frozenset(_TOKEN_RE.findall((context or "").lower()))
         bad: List[str] = []
-        for s in sent_split:
-            tokens = [t.lower() for t in re.findall(r"[A-Za-z0-9']+", s)]
+        for s, sl in zip(sent_split, sent_lower):
+            tokens = _TOKEN_RE.findall(sl)
             if not tokens:
                 continue
-            overlap = sum(1 for t in tokens if t in ctx)
-            ratio = overlap / max(len(tokens), 1)
+            overlap = sum(1 for t in tokens if t in ctx_tokens)
+            ratio = overlap / len(tokens)
             if ratio < 0.08 and len(s) > 20:
                 bad.append(s.strip())
         if not bad:
@@ -88,12 +233,18 @@ CONTEXT:
         # minor issues → WARN (not FAIL) because heuristic is conservative
         return {"verdict": "WARN", "unsupported_claims": bad[:5], "confidence": 0.55, "notes": "Heuristic overlap low on some sentences."}
 
+    def _heuristic_check(self, question: str, answer: str, context: str) -> Dict[str, Any]:
+        return self._heuristic_verify(answer, context)
+
     def check(self, question: str, answer: str, context: str) -> Dict[str, Any]:
-        # If llm client string contains "MockLLM" or lacks real API, use heuristic
-        cls = self.llm.__class__.__name__.lower()
-        if "mock" in cls:
+        # MockLLM (or any "mock" client) -> heuristic; real clients -> LLM verify
+        return self._verify(question, answer, context)
+
+    async def acheck(self, question: str, answer: str, context: str) -> Dict[str, Any]:
+        """Async `check`: awaits the verifier LLM instead of blocking a thread."""
+        if self._is_mock:
             return self._heuristic_verify(answer, context)
-        return self._llm_verify(question, answer, context)
+        return await self._allm_verify(question, answer, context)
 
 
 class AuditLoggerAgent:
@@ -104,15 +255,23 @@ class AuditLoggerAgent:
       - question
       - targets (detected tickers)
       - retrieved: [{id,title,link,ticker,score?}]  (score optional if available)
-      - context_hash (sha256 of string sent to LLM)
+      - context_hash (64-bit fingerprint of string sent to LLM), hash_algo
       - answer
       - fact_check: {...}
     """
+    # Bounded queue between request threads and the writer; full -> drop record
+    QUEUE_MAXSIZE = 10000
+    BATCH_SIZE = 128
+
     def __init__(self, log_path: Optional[str] = None):
         # Allow disabling file logging by passing an empty string or a special in-memory token
         env_path = os.getenv("NEWS_AUDIT_LOG", "")
         default_path = "logs/interactions.log"
         chosen = log_path if log_path is not None else (env_path or default_path)
+        self.dropped = 0
+        self._fd: Optional[int] = None
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=self.QUEUE_MAXSIZE)
+        self._worker: Optional[threading.Thread] = None
         # Treat empty string or ':memory:' as a signal to disable on-disk logging
         if chosen in ("", ":memory:"):
             self.log_path = ""  # empty -> no file writes
@@ -122,22 +281,97 @@ class AuditLoggerAgent:
             parent = os.path.dirname(self.log_path)
             if parent:
                 os.makedirs(parent, exist_ok=True)
+            # Raw append-only descriptor drained by a single background writer
+            self._fd = os.open(self.log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            self._worker = threading.Thread(target=self._drain, name="audit-log-writer", daemon=True)
+            self._worker.start()
+            atexit.register(self.close)
 
-    @staticmethod
-    def _iso_now() -> str:
-        # timezone-aware UTC; ISO-8601 with milliseconds + 'Z'
-        return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    # (epoch second, "YYYY-MM-DDTHH:MM:SS.") of the last _iso_now call; swapped
+    # as one tuple so concurrent callers never see a torn pair
+    _iso_second = (-1, "")
+
+    @classmethod
+    def _iso_now(cls) -> str:
+        # UTC ISO-8601 with milliseconds + 'Z', formatted straight from the clock;
+        # strftime runs at most once per second
+        secs, ns = divmod(time.time_ns(), 1_000_000_000)
+        cached = cls._iso_second
+        if cached[0] != secs:
+            cached = cls._iso_second = (secs, time.strftime("%Y-%m-%dT%H:%M:%S.", time.gmtime(secs)))
+        return cached[1] + f"{ns // 1_000_000:03d}Z"
 
     def log(self, payload: Dict[str, Any]) -> None:
+        # If no writer is running, this instance is configured as in-memory / disabled logging
+        if self._worker is None:
+            return
         try:
-            # If log_path is empty, this instance is configured as in-memory / disabled logging
-            if not self.log_path:
+            # Request path cost is a single enqueue; the writer thread serializes
+            self._q.put_nowait(payload)
+        except queue.Full:
+            # soft-fail logging under backpressure
+            self.dropped += 1
+
+    def _write_lines(self, lines: List[bytes]) -> None:
+        """Append encoded lines with as few syscalls as possible (one writev per batch)."""
+        if not hasattr(os, "writev"):  # e.g. Windows
+            lines = [b"".join(lines)]
+        while lines:
+            n = os.writev(self._fd, lines) if len(lines) > 1 else os.write(self._fd, lines[0])
+            # Short writes are rare on regular files; resume from where the kernel stopped
+            while lines and n >= len(lines[0]):
+                n -= len(lines[0])
+                lines.pop(0)
+            if lines and n:
+                lines[0] = lines[0][n:]
+
+    def _drain(self) -> None:
+        """Writer loop: batch queued records into one vectored write."""
+        while True:
+            batch = [self._q.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            lines: List[bytes] = []
+            for p in batch:
+                if p is _STOP:
+                    stop = True
+                    continue
+                # encode each record on its own: one bad record must not
+                # cost the rest of the batch
+                try:
+                    lines.append(_json_line(p))
+                except Exception:
+                    self.dropped += 1
+            try:
+                if lines:
+                    self._write_lines(lines)
+            except Exception:
+                # soft-fail logging
+                pass
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+            if stop:
                 return
-            with open(self.log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(payload, ensure_ascii=False) + "\n")
-        except Exception:
-            # soft-fail logging
-            pass
+
+    def flush(self) -> None:
+        """Block until every queued record has been handed to the OS."""
+        if self._worker is not None and self._worker.is_alive():
+            self._q.join()
+
+    def close(self) -> None:
+        """Drain the queue and close the log file; later records are dropped."""
+        worker, self._worker = self._worker, None
+        if worker is not None and worker.is_alive():
+            self._q.put(_STOP)
+            worker.join()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
 
     def build_and_log(
         self,
@@ -157,7 +391,7 @@ class AuditLoggerAgent:
             elapsed_ms = int((time.monotonic() - started_monotonic) * 1000)
 
         # Hash the exact context we sent to the LLM
-        ctx_hash = hashlib.sha256(context.encode("utf-8")).hexdigest()
+        ctx_hash = _ctx_hash(context)
 
         rec = {
             "started_at": started_at,
@@ -175,6 +409,7 @@ class AuditLoggerAgent:
                 } for d in hits
             ],
             "context_hash": ctx_hash,
+            "hash_algo": CONTEXT_HASH_ALGO,
             "answer": answer,
             "fact_check": fact_check,
         }
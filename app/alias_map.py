@@ -1,4 +1,13 @@
 # app/alias_map.py
+import re
+from functools import lru_cache
+
+# Optional C-backed Aho-Corasick automaton; fall back to a single regex scan
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
 ALIASES = {
     "AAPL": {"apple", "apple inc", "aapl", "iphone", "mac", "ipad", "watch", "vision pro"},
     "AMZN": {"amazon", "amazon.com", "amzn", "aws"},
@@ -11,10 +20,65 @@ ALIASES = {
     # add more as needed
 }
 
-def detect_tickers_from_query(q: str) -> set[str]:
-    ql = q.lower()
+
+def _build_matcher(aliases: dict[str, set[str]]):
+    """Compile every alias into one multi-pattern matcher.
+
+    Returns (automaton, None) when pyahocorasick is available, else
+    (None, (regex, alias_to_tickers)).
+    """
+    alias_to_tickers: dict[str, set[str]] = {}
+    for tkr, names in aliases.items():
+        for name in names:
+            alias_to_tickers.setdefault(name, set()).add(tkr)
+
+    if ahocorasick is not None:
+        ac = ahocorasick.Automaton()
+        for name, tkrs in alias_to_tickers.items():
+            ac.add_word(name, frozenset(tkrs))
+        ac.make_automaton()
+        return ac, None
+
+    # The zero-width lookahead reports one alias (the longest) per start
+    # offset, so fold the tickers of every alias that is a prefix of it in.
+    expanded = {
+        name: frozenset().union(
+            *(t for other, t in alias_to_tickers.items() if name.startswith(other))
+        )
+        for name in alias_to_tickers
+    }
+    alternation = "|".join(map(re.escape, sorted(expanded, key=len, reverse=True)))
+    return None, (re.compile(f"(?=({alternation}))"), expanded)
+
+
+_AC, _RE_MATCHER = _build_matcher(ALIASES)
+
+
+def _scan(ql: str) -> frozenset[str]:
+    """Tickers whose aliases occur anywhere in the already-lowercased text."""
     hits = set()
-    for tkr, names in ALIASES.items():
-        if any(a in ql for a in names):
-            hits.add(tkr)
-    return hits
+    if _AC is not None:
+        for _, tkrs in _AC.iter(ql):
+            hits |= tkrs
+        return frozenset(hits)
+    alias_re, expanded = _RE_MATCHER
+    for m in alias_re.finditer(ql):
+        hits |= expanded[m.group(1)]
+    return frozenset(hits)
+
+
+# Queries repeat (retries, replays, UI examples); documents do not, so only
+# the query path is memoized.
+_detect_impl = lru_cache(maxsize=4096)(_scan)
+
+
+def detect_tickers_from_query(q: str) -> set[str]:
+    return set(_detect_impl(q.lower().strip()))
+
+
+def detect_tickers_in_text(text: str, lowered: bool = False) -> set[str]:
+    """Uncached variant of `detect_tickers_from_query` for one-off document text.
+
+    Pass `lowered=True` when `text` is already lower-case to skip the copy.
+    """
+    return set(_scan(text if lowered else text.lower()))
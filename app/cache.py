@@ -0,0 +1,210 @@
+"""In-process caches for the `/chat` endpoint.
+
+`AnswerCache` sits in front of retrieval + the LLM call:
+  - exact: LRU keyed on the normalized question, detected tickers and the
+    LLM scope (provider and model).
+  - semantic: reuse a recent answer when the new question's word bigrams are
+    nearly identical (cosine >= threshold) to a cached one with the same
+    tickers and LLM scope. Bigrams keep word order, so "did A beat B" never
+    matches "did B beat A"; questions that differ in a negation or a number
+    never match.
+
+`RetrieverCache` memoizes `retrieve()` results per exact query and k, so a
+repeat that misses the answer cache (e.g. another LLM provider) still skips
+scoring.
+
+`FactCheckStore` holds the short-lived results of fact-checks that run after
+a `/chat` response has been sent, keyed by the response's request id.
+
+Entries are tied to the index they were computed from; binding a new index
+(e.g. after a dataset reload) drops everything.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Unicode word characters (any script) plus apostrophes, e.g. "didn't"
+_TOKEN_RE = re.compile(r"[\w']+")
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold and collapse punctuation/whitespace so trivial variants share a key."""
+    return " ".join(_TOKEN_RE.findall((question or "").casefold()))
+
+
+# Tokens that flip or qualify a question's meaning; a semantic hit must agree on them
+_NEGATIONS = frozenset({
+    "not", "no", "never", "nor", "without",
+    "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't", "weren't",
+    "won't", "can't", "hasn't", "haven't", "hadn't",
+})
+
+
+def _cosine(a: frozenset, b: frozenset) -> float:
+    # cosine similarity of binary feature vectors
+    if not a or not b:
+        return 0.0
+    return len(a & b) / math.sqrt(len(a) * len(b))
+
+
+def _features(q_norm: str) -> Tuple[frozenset, frozenset]:
+    """(word set, word-bigram set) of a normalized question."""
+    words = q_norm.split()
+    return frozenset(words), frozenset(zip(words, words[1:]))
+
+
+def _meaning_differs(a: frozenset, b: frozenset) -> bool:
+    # words present in only one question include a negation or a number
+    return any(w in _NEGATIONS or any(c.isdigit() for c in w) for w in a ^ b)
+
+
+class AnswerCache:
+    """Thread-safe exact + semantic cache; `maxsize=0` disables it."""
+
+    def __init__(self, maxsize: int = 1024, threshold: float = 0.95, semantic_window: int = 256):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.semantic_window = semantic_window
+        # key -> ((question words, question bigrams), cached value), oldest first
+        self._exact: "OrderedDict[Tuple, Tuple[Tuple[frozenset, frozenset], Any]]" = OrderedDict()
+        self._index = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scope(targets: Iterable[str], provider: str) -> Tuple:
+        return (tuple(sorted(targets)), provider)
+
+    def bind(self, index) -> None:
+        """Invalidate all entries when the underlying index object changes."""
+        with self._lock:
+            if index is not self._index:
+                self._exact.clear()
+                self._index = index
+
+    def get(self, question: str, targets: Iterable[str], provider: str) -> Optional[Any]:
+        """Cached value for an exact or near-duplicate question in the same scope, else None."""
+        if self.maxsize <= 0:
+            return None
+        q_norm = normalize_question(question)
+        if not q_norm:
+            return None
+        scope = self._scope(targets, provider)
+        key = (q_norm, scope)
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                return self._exact[key][1]
+            return self._semantic_match(q_norm, scope)
+
+    def _semantic_match(self, q_norm: str, scope: Tuple) -> Optional[Any]:
+        # caller holds self._lock; scan the most recent entries with the same scope
+        q_words, q_bigrams = _features(q_norm)
+        best, best_sim = None, self.threshold
+        recent = reversed(self._exact.items())
+        for n, ((_, other_scope), ((words, bigrams), value)) in enumerate(recent):
+            if n >= self.semantic_window:
+                break
+            if other_scope != scope or _meaning_differs(q_words, words):
+                continue
+            sim = _cosine(q_bigrams, bigrams)
+            if sim >= best_sim:
+                best, best_sim = value, sim
+        return best
+
+    def put(self, question: str, targets: Iterable[str], provider: str, value: Any) -> None:
+        """Store `value` for the question in its (targets, provider) scope."""
+        if self.maxsize <= 0:
+            return
+        q_norm = normalize_question(question)
+        if not q_norm:
+            # nothing to key on (e.g. punctuation only); never share an entry
+            return
+        key = (q_norm, self._scope(targets, provider))
+        with self._lock:
+            self._exact[key] = (_features(q_norm), value)
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.maxsize:
+                self._exact.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._exact.clear()
+
+
+class RetrieverCache:
+    """Thread-safe LRU of retrieval hits keyed by sha256(query) and k."""
+
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        self._hits: "OrderedDict[Tuple[str, int], List[Dict]]" = OrderedDict()
+        self._index = None
+        self._lock = threading.Lock()
+
+    def retrieve(
+        self, index, query: str, k: int, compute: Callable[..., List[Dict]], **kwargs
+    ) -> List[Dict]:
+        """Return cached hits for (query, k) on `index`.
+
+        On a miss the hits come from `compute(index, query, k=k, **kwargs)`.
+
+        `kwargs` must be derived from the query (e.g. its detected tickers);
+        they are not part of the key.
+        """
+        if self.maxsize <= 0:
+            return compute(index, query, k=k, **kwargs)
+        key = (hashlib.sha256(query.encode("utf-8")).hexdigest(), k)
+        with self._lock:
+            if index is not self._index:
+                self._hits.clear()
+                self._index = index
+            elif key in self._hits:
+                self._hits.move_to_end(key)
+                return list(self._hits[key])
+        hits = compute(index, query, k=k, **kwargs)
+        with self._lock:
+            if index is self._index:
+                self._hits[key] = list(hits)
+                while len(self._hits) > self.maxsize:
+                    self._hits.popitem(last=False)
+        return hits
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._hits.clear()
+
+
+class FactCheckStore:
+    """Thread-safe, bounded store of fact-check results; entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # request_id -> (monotonic deadline, result), oldest first
+        self._items: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, request_id: str, result: Dict) -> None:
+        """Store (or replace) the result for `request_id`, restarting its TTL."""
+        with self._lock:
+            self._items[request_id] = (time.monotonic() + self.ttl, result)
+            self._items.move_to_end(request_id)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Dict]:
+        """The stored result, or None when unknown or expired."""
+        with self._lock:
+            item = self._items.get(request_id)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._items[request_id]
+                return None
+            return item[1]
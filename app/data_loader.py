@@ -5,8 +5,29 @@ retriever and API layers.
 """
 
 import json
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+# Prefer the C-backed orjson parser; it also accepts raw bytes directly
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Parsed docs per resolved path, tagged with the stamp they were read at; only
+# the few most recently loaded files are kept
+_LOAD_CACHE_MAX = 4
+_LOAD_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]]" = OrderedDict()
+_LOAD_LOCK = threading.Lock()
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file: the one staleness rule for loaded news."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
 
 def _is_cleaned_item(it: Dict[str, Any]) -> bool:
     # cleaned/filtered items carry these fields
@@ -20,52 +41,80 @@ def load_news(json_path: str) -> List[Dict[str, Any]]:
       - title, text (from full_text), link
       - order_index: int
       - orig_ticker, repaired_ticker, label_confidence, reason, detected_tickers (optional)
+
+    Results are cached for the last few paths and reused until the file's
+    stamp (mtime, size) changes; each call returns a new list over the shared
+    doc dicts.
     """
-    raw = json.loads(Path(json_path).read_text())
+    path = os.path.realpath(json_path)
+    stamp = file_stamp(path)
+    with _LOAD_LOCK:
+        hit = _LOAD_CACHE.get(path)
+        if hit is not None and hit[0] == stamp:
+            _LOAD_CACHE.move_to_end(path)
+            return list(hit[1])
+    docs = _parse_news(path)
+    with _LOAD_LOCK:
+        _LOAD_CACHE[path] = (stamp, docs)
+        _LOAD_CACHE.move_to_end(path)
+        while len(_LOAD_CACHE) > _LOAD_CACHE_MAX:
+            _LOAD_CACHE.popitem(last=False)
+    return list(docs)
+
+
+def _parse_news(json_path: str) -> List[Dict[str, Any]]:
+    raw = _loads(Path(json_path).read_bytes())
     docs: List[Dict[str, Any]] = []
     seq = 0
 
     for bucket_key, items in raw.items():
-        for it in items:
-            # Common fields
-            title = (it.get("title") or "").strip()
-            text  = (it.get("full_text") or "").strip()
-            link  = (it.get("link") or "").strip()
-
-            if _is_cleaned_item(it):
-                # Cleaned/filtered schema
-                repaired = it.get("repaired_ticker") or bucket_key
-                orig     = it.get("orig_ticker") or bucket_key
-                oi       = it.get("order_index")
-                doc_id   = it.get("id") or f"{repaired}-{oi if oi is not None else seq}"
-
-                docs.append({
-                    "id": doc_id,
-                    "ticker": repaired, # canonical ticker to use downstream
-                    "title": title,
-                    "text": text,
-                    "link": link,
-                    "order_index": int(oi) if oi is not None else seq,
-
-                    # Pass-through metadata (useful for filtering/ranking/debug)
-                    "orig_ticker": orig,
-                    "repaired_ticker": repaired,
-                    "label_confidence": it.get("label_confidence"),
-                    "reason": it.get("reason"),
-                    "detected_tickers": it.get("detected_tickers", []),
-                })
-            else:
-                # Original schema fallback
-                doc_id = f"{bucket_key}-{seq}"
-                docs.append({
-                    "id": doc_id,
-                    "ticker": bucket_key,
-                    "title": title,
-                    "text": text,
-                    "link": link,
-                    "order_index": seq,
-                })
-
-            seq += 1
+        if not items:
+            continue
+        # Buckets come from a single producer, so the first item decides the
+        # schema for the whole bucket.
+        if _is_cleaned_item(items[0]):
+            _append_cleaned(items, bucket_key, docs, seq)
+        else:
+            _append_original(items, bucket_key, docs, seq)
+        seq += len(items)
 
     return docs
+
+
+def _append_cleaned(items: List[Dict[str, Any]], bucket_key: str, docs: List[Dict[str, Any]], start_seq: int) -> None:
+    """Normalize a bucket in the cleaned/filtered schema into `docs`."""
+    append = docs.append
+    for seq, it in enumerate(items, start_seq):
+        get = it.get
+        repaired = get("repaired_ticker") or bucket_key
+        oi = get("order_index")
+        append({
+            "id": get("id") or f"{repaired}-{oi if oi is not None else seq}",
+            "ticker": repaired, # canonical ticker to use downstream
+            "title": (get("title") or "").strip(),
+            "text": (get("full_text") or "").strip(),
+            "link": (get("link") or "").strip(),
+            "order_index": int(oi) if oi is not None else seq,
+
+            # Pass-through metadata (useful for filtering/ranking/debug)
+            "orig_ticker": get("orig_ticker") or bucket_key,
+            "repaired_ticker": repaired,
+            "label_confidence": get("label_confidence"),
+            "reason": get("reason"),
+            "detected_tickers": get("detected_tickers", []),
+        })
+
+
+def _append_original(items: List[Dict[str, Any]], bucket_key: str, docs: List[Dict[str, Any]], start_seq: int) -> None:
+    """Normalize a bucket in the original (raw) schema into `docs`."""
+    append = docs.append
+    for seq, it in enumerate(items, start_seq):
+        get = it.get
+        append({
+            "id": f"{bucket_key}-{seq}",
+            "ticker": bucket_key,
+            "title": (get("title") or "").strip(),
+            "text": (get("full_text") or "").strip(),
+            "link": (get("link") or "").strip(),
+            "order_index": seq,
+        })
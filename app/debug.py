@@ -0,0 +1,19 @@
+"""Debug helpers shared by the API and LLM adapters (opt-in /tmp dumps)."""
+
+import json
+
+# Faster debug-dump serialization when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json(path: str, obj) -> None:
+    """Write `obj` as indented JSON to `path` (debug helper)."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
@@ -1,15 +1,20 @@
 """Dependency providers used by FastAPI endpoints.
 
-This module exposes cached helpers to load docs, build the index, and
-select an LLM provider based on environment variables.
+This module exposes cached helpers to load docs and build the index (both
+refreshed when the news file changes on disk), share the answer cache and
+audit logger, and select an LLM provider based on environment variables.
 """
 
+import hashlib
 import os
+import threading
 from functools import lru_cache
 import logging
-from .data_loader import load_news
+from .data_loader import file_stamp, load_news
 from .retriever import build_index
 from .llm import MockLLM, OpenAILLM, LLMClient
+from .agents import AuditLoggerAgent
+from .cache import AnswerCache, FactCheckStore, RetrieverCache
 
 NEWS_PATH_DEFAULT = os.getenv("NEWS_JSON_PATH", "stock_news.cleaned.json")
 
@@ -17,24 +22,113 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@lru_cache(maxsize=1)
+class _NewsSnapshot:
+    """Docs + index for one news file, reloaded when the file's stamp changes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._docs = None
+        self._index = None
+
+    def _refresh(self) -> None:
+        # caller holds self._lock; same (mtime, size) rule as load_news
+        stamp = file_stamp(self.path)
+        if stamp != self._stamp:
+            logger.info("loading news from %s", self.path)
+            self._docs = load_news(self.path)
+            self._index = None
+            self._stamp = stamp
+
+    def docs(self):
+        with self._lock:
+            self._refresh()
+            return self._docs
+
+    def index(self):
+        with self._lock:
+            self._refresh()
+            if self._index is None:
+                self._index = build_index(self._docs)
+            return self._index
+
+
+_NEWS = _NewsSnapshot(NEWS_PATH_DEFAULT)
+
 def get_docs():
-    return load_news(NEWS_PATH_DEFAULT)
+    return _NEWS.docs()
 
-@lru_cache(maxsize=1)
 def get_index():
-    return build_index(get_docs())
+    return _NEWS.index()
+
+@lru_cache(maxsize=1)
+def get_answer_cache() -> AnswerCache:
+    """Process-wide /chat answer cache; NEWS_ANSWER_CACHE_SIZE=0 disables it."""
+    return AnswerCache(maxsize=int(os.getenv("NEWS_ANSWER_CACHE_SIZE", "1024")))
+
+@lru_cache(maxsize=1)
+def get_retriever_cache() -> RetrieverCache:
+    """Process-wide retrieve() result cache; NEWS_RETRIEVER_CACHE_SIZE=0 disables it."""
+    return RetrieverCache(maxsize=int(os.getenv("NEWS_RETRIEVER_CACHE_SIZE", "2048")))
+
+@lru_cache(maxsize=1)
+def get_factcheck_store() -> FactCheckStore:
+    """Process-wide store of background fact-check results (see /chat/{request_id}/factcheck)."""
+    return FactCheckStore(ttl=float(os.getenv("NEWS_FACTCHECK_TTL", "600")))
+
+def get_audit_logger() -> AuditLoggerAgent:
+    """Return the shared audit logger for the current NEWS_AUDIT_LOG path."""
+    return _audit_logger_for(os.getenv("NEWS_AUDIT_LOG", ""))
+
+@lru_cache(maxsize=None)
+def _audit_logger_for(env_path: str) -> AuditLoggerAgent:
+    # One long-lived logger (and file handle) per configured path
+    return AuditLoggerAgent(log_path=env_path or None)
+
+# Built clients keyed by (provider, model, api-key fingerprint): the OpenAI
+# client (and its HTTP connection pool) is reused until the env changes.
+_LLM_CACHE: dict = {}
+_LLM_LOCK = threading.Lock()
+
+def _llm_class(provider: str) -> type:
+    return OpenAILLM if provider == "openai" else MockLLM
+
+def _build_llm(provider: str) -> LLMClient:
+    cls = _llm_class(provider)
+    logger.info("get_llm -> %s", cls.__name__)
+    return cls()
+
+def defers_fact_checks() -> bool:
+    """
+    True when /chat may answer before its fact-check is done, i.e. a real LLM
+    without the combined JSON-mode call (COMBINED_LLM=0 or no JSON mode).
+    Those verdicts live in the answering process's FactCheckStore.
+    """
+    cls = _llm_class(os.getenv("LLM_PROVIDER", "mock").lower())
+    if cls is MockLLM:
+        return False
+    return os.getenv("COMBINED_LLM", "1") == "0" or not cls.supports_json_mode
 
-# @lru_cache(maxsize=1)
 def get_llm() -> LLMClient:
     """
-    Instantiate LLM client on each call so tests and env changes take effect.
-    Use LLM_PROVIDER env var ("mock" or "openai").
+    Return the LLM client for the current environment.
+    Use LLM_PROVIDER env var ("mock" or "openai"); changing LLM_PROVIDER,
+    OPENAI_MODEL or OPENAI_API_KEY yields a fresh client.
     """
     provider = os.getenv("LLM_PROVIDER", "mock").lower()
-    if provider == "openai":
-        logger.info("get_llm -> OpenAILLM")
-        return OpenAILLM()
-    logger.info("get_llm -> MockLLM")
-    return MockLLM()
-    # return OpenAILLM() if (os.getenv("LLM_PROVIDER","mock").lower()=="openai") else MockLLM()
+    key = (
+        provider,
+        os.getenv("OPENAI_MODEL", ""),
+        hashlib.blake2s(os.getenv("OPENAI_API_KEY", "").encode("utf-8")).hexdigest()[:8],
+    )
+    with _LLM_LOCK:
+        llm = _LLM_CACHE.get(key)
+        if llm is None:
+            llm = _LLM_CACHE[key] = _build_llm(provider)
+        return llm
+
+def reset_llm_cache() -> None:
+    """Drop cached LLM clients (tests, key rotation)."""
+    with _LLM_LOCK:
+        _LLM_CACHE.clear()
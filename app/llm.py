@@ -4,25 +4,46 @@ Provides a deterministic `MockLLM` for tests and a thin `OpenAILLM` wrapper
 for production usage when `LLM_PROVIDER=openai` is set.
 """
 
+import asyncio
 import os
 from abc import ABC, abstractmethod
 from typing import Optional
 
 # Optionally import OpenAI only if needed
 try:
-    from openai import OpenAI  # openai>=1.0 style
+    from openai import AsyncOpenAI, OpenAI  # openai>=1.0 style
 except Exception:
-    OpenAI = None  # keeps local tests clean
+    OpenAI = AsyncOpenAI = None  # keeps local tests clean
 
+from .debug import dump_json
 # import the markers so we can parse precisely
 from .prompts import CONTEXT_START, CONTEXT_END, ANSWER_SYSTEM_PROMPT
 
+# Per-request /tmp debug dumps are opt-in (NEWS_DEBUG_DUMP=1), resolved once
+_DEBUG_DUMP = bool(os.getenv("NEWS_DEBUG_DUMP"))
+
+# MockLLM's fixed reply text
+_MOCK_REFUSAL = "I don’t know based on the provided news dataset."
+_MOCK_SOURCES_HEADER = "\nSources:\n"
+
+
 class LLMClient(ABC):
     """Abstract LLM interface so the app and tests don't care about the provider."""
+    # True when `acomplete_json` constrains the reply to a JSON object
+    supports_json_mode = False
+
     @abstractmethod
     def complete(self, prompt: str, *, system: Optional[str] = None) -> str:
         ...
 
+    async def acomplete(self, prompt: str, *, system: Optional[str] = None) -> str:
+        """Async variant; defaults to running `complete` in a worker thread."""
+        return await asyncio.to_thread(self.complete, prompt, system=system)
+
+    async def acomplete_json(self, prompt: str, *, system: Optional[str] = None) -> str:
+        """Like `acomplete`, but asks for a JSON object reply where the provider supports it."""
+        return await self.acomplete(prompt, system=system)
+
 class MockLLM(LLMClient):
     """
     Deterministic offline LLM:
@@ -38,39 +59,42 @@ class MockLLM(LLMClient):
             ctx = raw.split(CONTEXT_START, 1)[-1].split(CONTEXT_END, 1)[0].strip()
         else:
             # No recognizable context → refuse
-            return "I don’t know based on the provided news dataset."
+            return _MOCK_REFUSAL
 
 
-        # 2) Find bracketed sources & make a simple first line
-        lines = [l.strip() for l in ctx.splitlines() if l.strip()]
-
-        # Collect sources of the form: [Title] ... (link: URL)
+        # 2) One pass over the lines: bracketed sources ([Title] ... (link: URL))
+        #    and, as a lead, the first non-bracket line; stops once both are found
         sources = []
-        for l in lines:
-            if l.startswith("[") and "]" in l:
-                title = l.split("]", 1)[0].lstrip("[").strip()
-                link = ""
-                if "(link:" in l:
-                    link = l.split("(link:", 1)[-1].split(")", 1)[0].strip()
-                sources.append((title, link))
+        lead = ""
+        for l in ctx.splitlines():
+            l = l.strip()
+            if not l:
+                continue
+            if l.startswith("["):
+                if len(sources) < 3 and "]" in l:
+                    title = l.split("]", 1)[0].lstrip("[").strip()
+                    link = ""
+                    if "(link:" in l:
+                        link = l.split("(link:", 1)[-1].split(")", 1)[0].strip()
+                    sources.append((title, link))
+            elif not lead:
+                lead = l
+            if lead and len(sources) >= 3:
+                break
         if not sources:
             # No properly formatted sources → refuse (don’t echo instructions)
-            return "I don’t know based on the provided news dataset."
+            return _MOCK_REFUSAL
 
-        # crude but deterministic “summary”: use the first non-bracket line as a lead, else use the title
-        lead = ""
-        for l in lines:
-            if l.startswith("["):
-                continue
-            lead = l
-            break
+        # crude but deterministic “summary”: the first non-bracket line, else the title
         if not lead:
             lead = f"{sources[0][0]}."
 
         src_str = "\n".join(f"- {t} — {u or '#'}" for t,u in sources[:3])
-        return f"""{lead}
-Sources:
-{src_str}"""
+        return "".join((lead, _MOCK_SOURCES_HEADER, src_str))
+
+    async def acomplete(self, prompt: str, *, system: Optional[str] = None) -> str:
+        # Pure string work; no need for a thread hop
+        return self.complete(prompt, system=system)
 
 class OpenAILLM(LLMClient):
     """
@@ -78,6 +102,8 @@ class OpenAILLM(LLMClient):
       LLM_PROVIDER=openai
       OPENAI_API_KEY=...
     """
+    supports_json_mode = True
+
     def __init__(self, model: str = None):
         if OpenAI is None:
             raise RuntimeError("OpenAI SDK not available. Install openai>=1.0.")
@@ -85,24 +111,23 @@ class OpenAILLM(LLMClient):
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY is not set.")
         self.client = OpenAI(api_key=api_key)
+        self.aclient = AsyncOpenAI(api_key=api_key) if AsyncOpenAI is not None else None
         self.model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
-    def complete(self, prompt: str, *, system: Optional[str] = None) -> str:
+    def _messages(self, prompt: str, system: Optional[str]) -> list:
         msgs = []
         if system:
             msgs.append({"role": "system", "content": system})
         msgs.append({"role": "user", "content": prompt})
         # Debug: persist the outgoing messages payload (no API key written)
-        try:
-            import json
-
-            open("/tmp/last_openai_messages.json", "w", encoding="utf-8").write(
-                json.dumps({"model": self.model, "messages": msgs, "prompt_len": len(prompt)}, ensure_ascii=False, indent=2)
-            )
-        except Exception:
-            pass
+        if _DEBUG_DUMP:
+            try:
+                dump_json("/tmp/last_openai_messages.json", {"model": self.model, "messages": msgs, "prompt_len": len(prompt)})
+            except Exception:
+                pass
+        return msgs
 
-        resp = self.client.chat.completions.create(model=self.model, messages=msgs, temperature=0.2)
+    def _content(self, resp) -> str:
         # Persist the model's raw response for debugging (avoid writing secrets)
         try:
             content = resp.choices[0].message.content.strip()
@@ -113,22 +138,38 @@ class OpenAILLM(LLMClient):
             except Exception:
                 content = ""
 
-        try:
-            import json
-
-            wrapper = {"content": content}
-            # Attempt to include a JSON-serializable version of resp if available
-            if hasattr(resp, "model_dump"):
-                try:
-                    wrapper["resp_json"] = resp.model_dump()
-                except Exception:
+        if _DEBUG_DUMP:
+            try:
+                wrapper = {"content": content}
+                # Attempt to include a JSON-serializable version of resp if available
+                if hasattr(resp, "model_dump"):
+                    try:
+                        wrapper["resp_json"] = resp.model_dump()
+                    except Exception:
+                        wrapper["resp_repr"] = repr(resp)
+                else:
                     wrapper["resp_repr"] = repr(resp)
-            else:
-                wrapper["resp_repr"] = repr(resp)
 
-            open("/tmp/last_openai_response.json", "w", encoding="utf-8").write(json.dumps(wrapper, ensure_ascii=False, indent=2))
-            open("/tmp/last_openai_response.txt", "w", encoding="utf-8").write(content)
-        except Exception:
-            pass
+                dump_json("/tmp/last_openai_response.json", wrapper)
+                open("/tmp/last_openai_response.txt", "w", encoding="utf-8").write(content)
+            except Exception:
+                pass
 
         return content
+
+    def complete(self, prompt: str, *, system: Optional[str] = None) -> str:
+        msgs = self._messages(prompt, system)
+        resp = self.client.chat.completions.create(model=self.model, messages=msgs, temperature=0.2)
+        return self._content(resp)
+
+    async def acomplete(self, prompt: str, *, system: Optional[str] = None, **create_kwargs) -> str:
+        msgs = self._messages(prompt, system)
+        create_kwargs.update(model=self.model, messages=msgs, temperature=0.2)
+        if self.aclient is None:
+            resp = await asyncio.to_thread(self.client.chat.completions.create, **create_kwargs)
+        else:
+            resp = await self.aclient.chat.completions.create(**create_kwargs)
+        return self._content(resp)
+
+    async def acomplete_json(self, prompt: str, *, system: Optional[str] = None) -> str:
+        return await self.acomplete(prompt, system=system, response_format={"type": "json_object"})
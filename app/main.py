@@ -2,25 +2,47 @@
 """Main FastAPI app for the Finance News RAG Chat service."""
 
 from typing import Dict, List, Set
-from fastapi import FastAPI
-import json
+from fastapi import BackgroundTasks, FastAPI, HTTPException
+import asyncio
 import logging
 import time
+import uuid
+from collections import deque
 from datetime import datetime, timezone
 import os
 import re
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
-
 from .alias_map import detect_tickers_from_query
-from .deps import get_docs, get_index, get_llm
+from .deps import (
+    get_answer_cache,
+    get_audit_logger,
+    get_docs,
+    get_factcheck_store,
+    get_index,
+    get_llm,
+    get_retriever_cache,
+)
 
 # Project imports
 from .models import ChatRequest, ChatResponse, Citation, Healthz, FactCheckResult
-from .prompts import ANSWER_SYSTEM_PROMPT, build_answer_prompt
+from .prompts import ANSWER_SYSTEM_PROMPT, COMBINED_SYSTEM_PROMPT, build_answer_prompt
 from .retriever import retrieve
-from .agents import FactCheckAgent, AuditLoggerAgent
+from .agents import FactCheckAgent
+from .debug import dump_json
+
+logger = logging.getLogger(__name__)
+
+# Per-request /tmp debug dumps are opt-in (NEWS_DEBUG_DUMP=1), resolved once
+_DEBUG_DUMP = bool(os.getenv("NEWS_DEBUG_DUMP"))
+
+# Simplified hits (no questions) of the most recent /chat requests, kept and
+# served by /debug/last_hits only when NEWS_DEBUG_DUMP is on
+_LAST_HITS: deque = deque(maxlen=8)
+
+# Answer + fact-check in one JSON-mode LLM call for clients that support it;
+# COMBINED_LLM=0 keeps the separate (background) verifier call
+_COMBINED_LLM = os.getenv("COMBINED_LLM", "1") != "0"
 
 app = FastAPI(title="Finance News RAG Chat")
 
@@ -38,16 +60,21 @@ def _format_context(hits: List[Dict], max_items: int = 3) -> str:
     [Title] short excerpt (link: URL)
     """
     lines = []
-    seen = set()
+    # Dedupe keyed on the link (title when a hit has no link); avoids building
+    # a (title, link) tuple per hit. Output order follows `hits`.
+    seen: Set[str] = set()
     count = 0
     for d in hits:
-        key = (d.get("title"), d.get("link"))
+        key = d.get("link") or d.get("title") or ""
         if key in seen:
             continue
         seen.add(key)
         count += 1
         title = d.get("title") or "Untitled"
-        body = (d.get("text") or d.get("title") or "")[:220].replace("\n", " ")
+        body = (d.get("text") or d.get("title") or "")[:220]
+        # most snippets have no line breaks/tabs; skip the copies then
+        if "\n" in body or "\r" in body or "\t" in body:
+            body = body.replace("\n", " ").replace("\r", " ").replace("\t", " ")
         url = d.get("link") or "#"
         # Numbered, machine-friendly entries
         lines.append(f"{count}) [{title}] {body} (LINK: {url})")
@@ -61,6 +88,13 @@ def _format_context(hits: List[Dict], max_items: int = 3) -> str:
     return "CONTEXT:\n" + "\n".join(lines)
 
 
+def _is_target_doc(d: Dict, targets: Set[str]) -> bool:
+    rt = (d.get("repaired_ticker") or d.get("ticker") or "").upper()
+    if rt in targets:
+        return True
+    return any(t in targets for t in d.get("detected_tickers") or ())
+
+
 def _build_citations(
     hits: List[Dict],
     targets: Set[str],
@@ -75,43 +109,16 @@ def _build_citations(
     """
     citations: List[Dict] = []
     seen = set()
-    non_target_used = 0
-
-    def is_target_doc(d: Dict) -> bool:
-        if not targets:
-            return False
-        rt = (d.get("repaired_ticker") or d.get("ticker") or "").upper()
-        if rt in targets:
-            return True
-        det = set((d.get("detected_tickers") or []))
-        return bool(det & targets)
 
     # First pass: take target-matching docs
-    for d in hits:
-        if len(citations) >= max_items:
-            break
-        if is_target_doc(d):
-            key = (d["title"], d["link"])
-            if key in seen:
-                continue
-            citations.append(
-                {
-                    "title": d["title"],
-                    "link": d["link"],
-                    "ticker": d.get("repaired_ticker") or d.get("ticker"),
-                }
-            )
-            seen.add(key)
-
-    # Second pass: allow limited non-target backfill to reach max_items
-    if len(citations) < max_items:
+    if targets:
         for d in hits:
             if len(citations) >= max_items:
-                break
-            key = (d["title"], d["link"])
-            if key in seen:
-                continue
-            if not targets or non_target_used < max_non_target:
+                return citations
+            if _is_target_doc(d, targets):
+                key = (d["title"], d["link"])
+                if key in seen:
+                    continue
                 citations.append(
                     {
                         "title": d["title"],
@@ -120,8 +127,25 @@ def _build_citations(
                     }
                 )
                 seen.add(key)
-                if targets:
-                    non_target_used += 1
+
+    # Second pass: allow limited non-target backfill to reach max_items
+    non_target_used = 0
+    for d in hits:
+        if len(citations) >= max_items or (targets and non_target_used >= max_non_target):
+            break
+        key = (d["title"], d["link"])
+        if key in seen:
+            continue
+        citations.append(
+            {
+                "title": d["title"],
+                "link": d["link"],
+                "ticker": d.get("repaired_ticker") or d.get("ticker"),
+            }
+        )
+        seen.add(key)
+        if targets:
+            non_target_used += 1
 
     return citations
 
@@ -144,8 +168,98 @@ def _is_mock_llm(llm) -> bool:
     return llm.__class__.__name__.lower().startswith("mock")
 
 
+def _simple_hits(hits: List[Dict]) -> List[Dict]:
+    return [{"id": h.get("id"), "title": h.get("title"), "link": h.get("link")} for h in hits]
+
+
+def _write_debug_hits(simple_hits: List[Dict]) -> None:
+    try:
+        dump_json("/tmp/last_hits.json", simple_hits)
+    except Exception:
+        logger.exception("failed writing /tmp/last_hits.json")
+
+
+def _write_debug_context(context: str) -> None:
+    try:
+        Path("/tmp/last_context.txt").write_text(context or "", encoding="utf-8")
+    except Exception:
+        logger.exception("failed writing /tmp/last_context.txt")
+
+
+_PENDING_FC = {"verdict": "PENDING", "unsupported_claims": [], "confidence": 0.0, "notes": "Fact check in progress."}
+_ERROR_FC = {"verdict": "ERROR", "unsupported_claims": [], "confidence": 0.0, "notes": "Fact check failed."}
+
+
+async def _post_answer_work(
+    *,
+    llm,
+    request_id: str,
+    response: ChatResponse,
+    fact_check,
+    question: str,
+    targets: Set[str],
+    hits: List[Dict],
+    context: str,
+    cite_dicts: List[Dict],
+    llm_scope: str,
+    started_wall: str,
+    started_mono: float,
+) -> None:
+    """Runs after a /chat response is sent: fact-check, audit log, answer cache.
+
+    Failures are logged, never raised: a failed fact-check is stored as an
+    "ERROR" verdict so pollers stop waiting, and its answer is not cached.
+    """
+    fc = fact_check
+    try:
+        if fc is None:
+            fc_agent = FactCheckAgent(llm_client=llm)
+            fc = await fc_agent.acheck(question=question, answer=response.answer, context=context)
+        get_factcheck_store().put(request_id, fc)
+    except Exception:
+        logger.exception("fact-check failed for request %s", request_id)
+        fc = _ERROR_FC
+        get_factcheck_store().put(request_id, fc)
+
+    try:
+        # AUDIT LOG agent
+        audit = get_audit_logger()  # uses NEWS_AUDIT_LOG env or logs/interactions.log
+        audit.build_and_log(
+            started_at=started_wall,
+            question=question,
+            targets=sorted(targets),
+            hits=hits,
+            context=context,
+            answer=response.answer,
+            fact_check=fc,
+            extra={"citations": cite_dicts, "request_id": request_id},
+            started_monotonic=started_mono
+        )
+    except Exception:
+        logger.exception("audit logging failed for request %s", request_id)
+
+    if fc is _ERROR_FC:
+        return
+    try:
+        # Cache the completed response (final verdict) for repeat questions
+        get_answer_cache().put(question, targets, llm_scope, {
+            "response": ChatResponse(
+                answer=response.answer,
+                citations=response.citations,
+                fact_check=FactCheckResult(**fc),
+                request_id=request_id,
+            ),
+            "hits": hits,
+            "context": context,
+            "fact_check": fc,
+            "citations": cite_dicts,
+        })
+    except Exception:
+        logger.exception("answer caching failed for request %s", request_id)
+
+
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest, background_tasks: BackgroundTasks):
     """Chat endpoint: answer a question about the news dataset."""
     started_wall = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
     started_mono = time.monotonic()
@@ -161,20 +275,43 @@ def chat(req: ChatRequest):
     # Detect target tickers from the query (e.g., {"AAPL"})
     targets = detect_tickers_from_query(q)
 
-    # Retrieve candidate documents (broad pool + soft scoring in retriever)
-    idx = get_index()
-    hits = retrieve(idx, q, k=8)
-
-    # Debug: dump simplified hits (id, title, link) so we can inspect what was
-    # retrieved at runtime. Do not write sensitive data.
-    try:
-        simple = [
-            {"id": h.get("id"), "title": h.get("title"), "link": h.get("link")}
-            for h in hits
-        ]
-        open("/tmp/last_hits.json", "w", encoding="utf-8").write(json.dumps(simple, ensure_ascii=False, indent=2))
-    except Exception:
-        logger.exception("failed writing /tmp/last_hits.json")
+    # Answer cache: exact/near-duplicate questions skip retrieval and the LLM
+    # (the first get_index call loads the dataset, so keep it off the loop)
+    idx = await asyncio.to_thread(get_index)
+    cache = get_answer_cache()
+    cache.bind(idx)
+    llm = get_llm()
+    # Answers are scoped to the provider and model that produced them
+    llm_scope = f'{os.getenv("LLM_PROVIDER", "mock").lower()}:{getattr(llm, "model", "")}'
+    cached = cache.get(q, targets, llm_scope)
+    if cached is not None:
+        get_audit_logger().build_and_log(
+            started_at=started_wall,
+            question=q,
+            targets=sorted(targets),
+            hits=cached["hits"],
+            context=cached["context"],
+            answer=cached["response"].answer,
+            fact_check=cached["fact_check"],
+            extra={"citations": cached["citations"], "cache_hit": True},
+            started_monotonic=started_mono
+        )
+        if _DEBUG_DUMP:
+            _LAST_HITS.append(_simple_hits(cached["hits"]))
+        return cached["response"]
+
+    # Retrieve candidate documents (broad pool + soft scoring in retriever);
+    # repeated identical queries reuse the cached hits. Targets were detected
+    # above, so the retriever does not scan the query again.
+    hits = await asyncio.to_thread(get_retriever_cache().retrieve, idx, q, 8, retrieve, targets=targets)
+
+    # Debug: keep/dump simplified hits (id, title, link) so we can inspect what
+    # was retrieved at runtime. Do not record sensitive data. The /tmp dump is
+    # written after the response is sent.
+    if _DEBUG_DUMP:
+        simple = _simple_hits(hits)
+        _LAST_HITS.append(simple)
+        background_tasks.add_task(_write_debug_hits, simple)
 
     if not hits:
         return ChatResponse(
@@ -187,53 +324,90 @@ def chat(req: ChatRequest):
     context = _format_context(hits, max_items=3)
 
     # Debug: persist the exact context string sent to the LLM for troubleshooting
-    try:
-        open("/tmp/last_context.txt", "w", encoding="utf-8").write(context or "")
-    except Exception:
-        logger.exception("failed writing /tmp/last_context.txt")
+    if _DEBUG_DUMP:
+        background_tasks.add_task(_write_debug_context, context)
+
+    combined = _COMBINED_LLM and getattr(llm, "supports_json_mode", False) and not _is_mock_llm(llm)
 
     # (Optional but recommended) Emphasize the target in the system prompt
-    system_prompt = ANSWER_SYSTEM_PROMPT
+    focus = ""
     if targets:
         tickers_str = ", ".join(sorted(targets))
-        system_prompt = (
-            ANSWER_SYSTEM_PROMPT
-            + f"\n\nFocus on: {tickers_str}. Only cite items clearly related to these tickers."
-        )
-
-    # Ask the LLM for an answer
-    llm = get_llm()
-    answer = llm.complete(build_answer_prompt(q, context), system=system_prompt)
-
-    # FACT-CHECK agent
-    fc_agent = FactCheckAgent(llm_client=llm)
-    if not _is_mock_llm(llm):
-        fc = fc_agent.check(question=q, answer=answer, context=context)
-    else:
-        fc = {"verdict": "SKIPPED", "unsupported_claims": [], "confidence": 0.0, "notes": "Fact check disabled in mock mode."}
+        focus = f"\n\nFocus on: {tickers_str}. Only cite items clearly related to these tickers."
+
+    # Ask the LLM for an answer (awaited; the event loop keeps serving)
+    answer, fc = None, None
+    if combined:
+        # One round-trip returns the answer and its fact-check; a reply that
+        # is not the expected JSON falls back to the separate verifier
+        raw = await llm.acomplete_json(build_answer_prompt(q, context), system=COMBINED_SYSTEM_PROMPT + focus)
+        answer, fc = FactCheckAgent.split_combined(raw)
+        if answer is None:
+            logger.warning("combined reply had no answer field; retrying without JSON mode")
+    if answer is None:
+        answer = await llm.acomplete(build_answer_prompt(q, context), system=ANSWER_SYSTEM_PROMPT + focus)
+    if combined and fc is None:
+        # Combined mode never defers the verdict (multi-worker servers rely on
+        # it, see defers_fact_checks): verify the fallback answer inline
+        try:
+            fc = await FactCheckAgent(llm_client=llm).acheck(question=q, answer=answer, context=context)
+        except Exception:
+            logger.exception("inline fact-check failed")
+            fc = _ERROR_FC
 
     # Build citations with the “prefer target, allow one related” policy
     cite_dicts = _build_citations(hits, targets, max_items=3, max_non_target=1)
 
+    # FACT-CHECK agent: a real verifier is a second LLM round-trip, so it runs
+    # after the response is sent; clients poll /chat/{request_id}/factcheck
+    if _is_mock_llm(llm):
+        fc = {"verdict": "SKIPPED", "unsupported_claims": [], "confidence": 0.0, "notes": "Fact check disabled in mock mode."}
+    request_id = uuid.uuid4().hex
+    get_factcheck_store().put(request_id, fc or _PENDING_FC)
+
     # answer_raw = llm.complete(build_answer_prompt(q, context), system=system_prompt)
     # sources_block = _make_sources_block(cite_dicts, max_items=3)
     # answer_with_sources = answer if not sources_block else f"{answer}\n\n{sources_block}"
 
-
-
-    # AUDIT LOG agent
-    audit = AuditLoggerAgent()  # uses NEWS_AUDIT_LOG env or logs/interactions.log
-    audit.build_and_log(
-        started_at=started_wall,
+    # Return typed response; fact-check (if any), audit and caching follow
+    response = ChatResponse(
+        answer=answer,
+        citations=[Citation(**c) for c in cite_dicts],
+        fact_check=FactCheckResult(**(fc or _PENDING_FC)),
+        request_id=request_id,
+    )
+    background_tasks.add_task(
+        _post_answer_work,
+        llm=llm,
+        request_id=request_id,
+        response=response,
+        fact_check=fc,
         question=q,
-        targets=sorted(list(targets)),
+        targets=targets,
         hits=hits,
         context=context,
-        answer=answer,
-        fact_check=fc,
-        extra={"citations": cite_dicts},
-        started_monotonic=started_mono
+        cite_dicts=cite_dicts,
+        llm_scope=llm_scope,
+        started_wall=started_wall,
+        started_mono=started_mono,
     )
+    return response
+
+
+@app.get("/chat/{request_id}/factcheck", response_model=FactCheckResult)
+def chat_factcheck(request_id: str):
+    """Fact-check for an earlier /chat response; verdict is "PENDING" until it finishes."""
+    fc = get_factcheck_store().get(request_id)
+    if fc is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired request_id.")
+    return FactCheckResult(**fc)
+
+
+def debug_last_hits() -> List[List[Dict]]:
+    """Simplified retrieval hits of the last few /chat requests, oldest first."""
+    return list(_LAST_HITS)
+
 
-    # Return typed response
-    return ChatResponse(answer=answer, citations=[Citation(**c) for c in cite_dicts], fact_check=FactCheckResult(**fc))
+# Debug-only route: not exposed unless NEWS_DEBUG_DUMP is set
+if _DEBUG_DUMP:
+    app.get("/debug/last_hits")(debug_last_hits)
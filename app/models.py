@@ -20,7 +20,7 @@ class Citation(BaseModel):
 
 
 class FactCheckResult(BaseModel):
-    verdict: str  # "PASS" | "WARN" | "FAIL"
+    verdict: str  # "PASS" | "WARN" | "FAIL" | "SKIPPED" | "PENDING" | "ERROR"
     unsupported_claims: List[str] = []
     confidence: float = 0.0
     notes: Optional[str] = None
@@ -32,6 +32,9 @@ class ChatResponse(BaseModel):
     answer: str
     citations: List[Citation]
     fact_check: Optional[FactCheckResult] = None
+    # Set when the fact-check finishes after the response; poll
+    # GET /chat/{request_id}/factcheck while its verdict is "PENDING"
+    request_id: Optional[str] = None
 
 
 class Healthz(BaseModel):
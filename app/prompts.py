@@ -46,6 +46,19 @@ reply exactly: "I don’t know based on the provided (cleaned) news dataset.".
 Always keep user safety and the system-first rule highest priority. """
 
 
+# Single-call variant: the answer and its fact-check come back as one JSON
+# object (used with JSON-mode clients unless COMBINED_LLM=0)
+COMBINED_SYSTEM_PROMPT = ANSWER_SYSTEM_PROMPT + """
+
+Output format: reply with ONE JSON object and nothing else:
+{"answer": "<your answer, including the Sources section>",
+ "fact_check": {"verdict": "PASS" | "WARN" | "FAIL",
+                "unsupported_claims": ["<claims in the answer NOT explicitly supported by the CONTEXT>"],
+                "confidence": <number in [0,1]>,
+                "notes": "<single short line rationale>"}}
+Judge the fact_check strictly against the CONTEXT only: PASS if every claim is
+supported, WARN for minor unsupported phrasing, FAIL for unsupported factual claims."""
+
 # ANSWER_SYSTEM_PROMPT = """You are a careful financial-news assistant.
 # Answer ONLY using the provided CONTEXT. Do not use external knowledge.
 # When a list of sources is provided in CONTEXT, you MUST include a Sources section that
@@ -79,16 +92,11 @@ Always keep user safety and the system-first rule highest priority. """
 CONTEXT_START = "<<<CONTEXT_START>>>"
 CONTEXT_END   = "<<<CONTEXT_END>>>"
 
+# Static parts of the answer prompt, assembled once at import
+_ANSWER_PROMPT_HEAD = f"SYSTEM:\n{ANSWER_SYSTEM_PROMPT}\n\nUSER QUESTION:\n"
+_ANSWER_PROMPT_MID = f"\n\nCONTEXT (snippets from news JSON):\n{CONTEXT_START}\n"
+_ANSWER_PROMPT_TAIL = f"\n{CONTEXT_END}\n"
+
 def build_answer_prompt(question: str, context: str) -> str:
     """Build the full prompt for the answer generation LLM call."""
-    return f"""SYSTEM:
-{ANSWER_SYSTEM_PROMPT}
-
-USER QUESTION:
-{question}
-
-CONTEXT (snippets from news JSON):
-{CONTEXT_START}
-{context}
-{CONTEXT_END}
-"""
+    return "".join((_ANSWER_PROMPT_HEAD, question, _ANSWER_PROMPT_MID, context, _ANSWER_PROMPT_TAIL))
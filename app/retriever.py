@@ -1,135 +1,250 @@
 """
 Retriever helpers: small deterministic ranking used for tests.
 
-This module contains simple, easily-auditable scoring logic used by the
-test-suite and as a baseline for later replacement with BM25/FAISS.
+This module contains simple, easily-auditable scoring logic: Okapi BM25 for
+the lexical side and a title-token stub for the semantic side (a baseline for
+later replacement with embeddings/FAISS).
 """
 
+import math
 import re
-from typing import Dict, List, Tuple
-
-from .alias_map import ALIASES, detect_tickers_from_query
-
-
-def _alias_hit(title: str, text: str, target: str) -> Tuple[bool, bool]:
-    """Returns (in_title, in_text) alias hits for a target ticker."""
-    names = ALIASES.get(target, set())
-    ttl = title.lower()
-    txt = text.lower()
-    in_title = any(n in ttl for n in names)
-    in_text = any(n in txt for n in names)
-    return in_title, in_text
-
-
-def _bm25_topk(index, docs: List[Dict], query: str, k: int) -> Dict[int, float]:
-    # TODO: replace with real BM25/TF-IDF. For now, simple keyword count.
-    q_terms = {w for w in re.findall(r"[A-Za-z0-9']+", query.lower()) if len(w) > 2}
-    scores = {}
-    for i, d in enumerate(docs):
-        blob = (d["title"] + " " + d["text"]).lower()
-        score = sum(1 for t in q_terms if t in blob)
-        if score > 0:
-            scores[i] = float(score)
-    return dict(sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k])
-
-
-def _embed_topk(emb, docs: List[Dict], query: str, k: int) -> Dict[int, float]:
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .alias_map import detect_tickers_from_query, detect_tickers_in_text
+
+
+_TERM_RE = re.compile(r"[A-Za-z0-9']+")
+
+# Okapi BM25 parameters
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+
+def _postings(token_lists) -> Tuple[List[str], List[np.ndarray]]:
+    """Inverted index: sorted vocabulary and, per token, the sorted doc rows containing it."""
+    rows: Dict[str, List[int]] = {}
+    for i, toks in enumerate(token_lists):
+        for t in toks:
+            rows.setdefault(t, []).append(i)
+    vocab = sorted(rows)
+    return vocab, [np.asarray(rows[t], dtype=np.int32) for t in vocab]
+
+
+def _build_bm25(titles: List[str], texts: List[str]) -> Dict:
+    """Okapi BM25 postings over the `title + " " + text` tokens.
+
+    Each posting stores the doc rows containing a term and their precomputed
+    term weights, idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl)),
+    so scoring a query is a scatter-add of its terms' postings.
+    """
+    n = len(titles)
+    rows: Dict[str, List[int]] = {}
+    tfs: Dict[str, List[int]] = {}
+    doc_len = np.zeros(n, dtype=np.float64)
+    for i, (t, x) in enumerate(zip(titles, texts)):
+        toks = _TERM_RE.findall(t + " " + x)
+        doc_len[i] = len(toks)
+        for term, tf in Counter(toks).items():
+            rows.setdefault(term, []).append(i)
+            tfs.setdefault(term, []).append(tf)
+    avgdl = float(doc_len.mean()) if n else 0.0
+    if avgdl > 0:
+        norm = _BM25_K1 * (1.0 - _BM25_B + _BM25_B * doc_len / avgdl)
+    else:
+        norm = np.full(n, _BM25_K1)
+
+    postings = {}
+    for term, term_rows in rows.items():
+        r = np.asarray(term_rows, dtype=np.int32)
+        tf = np.asarray(tfs[term], dtype=np.float64)
+        # non-negative idf variant (Lucene); common terms still score > 0
+        idf = math.log((n - len(r) + 0.5) / (len(r) + 0.5) + 1.0)
+        postings[term] = (r, idf * tf * (_BM25_K1 + 1.0) / (tf + norm[r]))
+    return {"n": n, "postings": postings}
+
+
+def _build_title_index(titles: List[str]) -> Dict:
+    """Title-token postings for the `_embed_topk` stub."""
+    vocab, post = _postings({*_TERM_RE.findall(t)} for t in titles)
+    return {"n": len(titles), "postings": dict(zip(vocab, post))}
+
+
+def _topk(scores: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k positive scores restricted to `rows`: (positions in `rows`, scores).
+
+    `np.partition` finds the k-th largest score in O(n); only the survivors
+    are sorted. Ties keep candidate order, as the stable `sorted` did.
+    """
+    sub = scores[rows]
+    pos = np.flatnonzero(sub > 0)
+    vals = sub[pos]
+    if len(vals) > k > 0:
+        kth = np.partition(vals, len(vals) - k)[len(vals) - k]
+        above = vals > kth
+        # fill the remaining slots with the earliest candidates tied at kth
+        tied = vals == kth
+        keep = above | (tied & (np.cumsum(tied) <= k - int(above.sum())))
+        pos, vals = pos[keep], vals[keep]
+    order = np.argsort(-vals, kind="stable")[:k]
+    return pos[order], vals[order]
+
+
+def _bm25_topk(bm, rows: np.ndarray, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    q_terms = {w for w in _TERM_RE.findall(query.lower()) if len(w) > 2}
+    scores = np.zeros(bm["n"], dtype=np.float64)
+    post = bm["postings"]
+    for t in q_terms:
+        if t in post:
+            term_rows, weights = post[t]
+            scores[term_rows] += weights
+    return _topk(scores, rows, k)
+
+
+def _embed_topk(emb, rows: np.ndarray, query: str, k: int) -> Tuple[np.ndarray, np.ndarray]:
     # TODO: replace with real embeddings/FAISS. For now, stub matches title tokens.
-    q_terms = set(re.findall(r"[A-Za-z0-9']+", query.lower()))
-    scores = {}
+    q_terms = set(_TERM_RE.findall(query.lower()))
+    scores = np.zeros(emb["n"], dtype=np.float64)
+    post = emb["postings"]
+    for t in q_terms:
+        if t in post:
+            scores[post[t]] += 1.0
+    return _topk(scores, rows, k)
+
+
+def _build_ticker_postings(docs: List[Dict], titles: List[str], texts: List[str]) -> Dict[str, Dict[str, np.ndarray]]:
+    """Inverted indexes ticker -> sorted doc rows, built in one corpus pass.
+
+    `repaired` / `detected` come from the cleaned labels; `alias_in_title` /
+    `alias_in_text` from one alias-automaton scan per field. A target filter
+    is then a union of a few posting lists instead of a pass over every doc.
+    """
+    def by_ticker(ticker_sets) -> Dict[str, np.ndarray]:
+        return dict(zip(*_postings(ticker_sets)))
+
+    return {
+        "repaired": by_ticker(
+            () if d.get("repaired_ticker") is None else (d["repaired_ticker"],) for d in docs
+        ),
+        "detected": by_ticker(set(d.get("detected_tickers") or ()) for d in docs),
+        "alias_in_title": by_ticker(detect_tickers_in_text(t, lowered=True) for t in titles),
+        "alias_in_text": by_ticker(detect_tickers_in_text(x, lowered=True) for x in texts),
+    }
+
+
+# Label-confidence weights; anything else (incl. missing) counts as LOW
+_CONF_WEIGHT = {"HIGH": 1.0, "MEDIUM": 0.9}
+
+
+def _build_doc_attrs(docs: List[Dict]) -> Dict[str, np.ndarray]:
+    """Per-doc scoring attributes as parallel arrays (SoA), computed once.
+
+    conf_w:  label-confidence weight (1.0 / 0.9 / 0.8)
+    recency: mild order_index boost, 1 + 0.05 * r (1.0 without order_index)
+    misc / multi: repaired ticker is MISC / MULTI (case-insensitive)
+    """
+    n = len(docs)
+    conf_w = np.empty(n, dtype=np.float64)
+    recency = np.ones(n, dtype=np.float64)
+    misc = np.zeros(n, dtype=bool)
+    multi = np.zeros(n, dtype=bool)
     for i, d in enumerate(docs):
-        ttl_terms = set(re.findall(r"[A-Za-z0-9']+", d["title"].lower()))
-        inter = len(q_terms & ttl_terms)
-        if inter:
-            scores[i] = float(inter)
-    return dict(sorted(scores.items(), key=lambda x: x[1], reverse=True)[:k])
+        conf_w[i] = _CONF_WEIGHT.get((d.get("label_confidence") or "LOW").upper(), 0.8)
+        # newer = higher
+        if "order_index" in d and n > 1:
+            r = 1.0 - (d["order_index"] / max(n - 1, 1))
+            recency[i] = 1.0 + 0.05 * r
+        rt = (d.get("repaired_ticker") or "").upper()
+        misc[i] = rt == "MISC"
+        multi[i] = rt == "MULTI"
+    return {"conf_w": conf_w, "recency": recency, "misc": misc, "multi": multi}
 
 
 def build_index(docs: List[Dict]):
     """Builds and returns a simple in-memory index structure."""
-    # Replace with real index builders (FAISS/BM25) and stash them here.
-    return {"docs": docs, "bm25": None, "emb": None}
-
-
-def retrieve(index, query: str, k: int = 8) -> List[Dict]:
-    """Retrieve top-k relevant docs for a query from the index."""
-    docs = index["docs"]
-    targets = detect_tickers_from_query(query)  # e.g., {"AAPL"}
-    # 1) Broad candidate pool
-    cands = []
+    # Replace the title-token stub with a real embedding index (FAISS) here.
+    # Title/text are lower-cased once here; every structure queries read is
+    # derived from them, so no doc text is case-folded per query. The docs
+    # themselves are not modified.
+    titles = [d["title"].lower() for d in docs]
+    texts = [d["text"].lower() for d in docs]
+    return {
+        "docs": docs,
+        "bm25": _build_bm25(titles, texts),
+        "emb": _build_title_index(titles),
+        "by_ticker": _build_ticker_postings(docs, titles, texts),
+        "attrs": _build_doc_attrs(docs),
+    }
+
+
+def retrieve(index, query: str, k: int = 8, targets: Optional[Set[str]] = None) -> List[Dict]:
+    """Retrieve top-k relevant docs for a query from the index.
+
+    `targets` are the query's tickers when the caller already detected them;
+    otherwise they are detected here.
+    """
+    docs, by_ticker = index["docs"], index["by_ticker"]
+    if targets is None:
+        targets = detect_tickers_from_query(query)  # e.g., {"AAPL"}
+    # 1) Broad candidate pool: repaired/detected ticker match, or textual
+    #    alias backstop, as a union of the targets' posting lists
+    rows = None
     if targets:
-        for d in docs:
-            if d.get("repaired_ticker") in targets or any(
-                t in targets for t in (d.get("detected_tickers") or [])
-            ):
-                cands.append(d)
-            else:
-                # textual alias backstop
-                if any(_alias_hit(d["title"], d["text"], t)[1] for t in targets):
-                    cands.append(d)
-    if not cands:
+        lists = [
+            by_ticker[field][t]
+            for field in ("repaired", "detected", "alias_in_text")
+            for t in targets
+            if t in by_ticker[field]
+        ]
+        if lists:
+            rows = np.unique(np.concatenate(lists))
+    if rows is None or not len(rows):
         # fallback to all docs (global search)
-        cands = docs
-
-    # 2) Base scores (hybrid)
-    bm = _bm25_topk(index["bm25"], cands, query, k=50)
-    em = _embed_topk(index["emb"], cands, query, k=50)
-
-    # Normalize to [0,1]
-    def norm_map(m):
-        if not m:
-            return {}
-        mx = max(m.values())
-        return {i: (s / mx) for i, s in m.items()} if mx > 0 else {}
-
-    bm, em = norm_map(bm), norm_map(em)
-    base = {}
-    for i in set(list(bm.keys()) + list(em.keys())):
-        base[i] = 0.55 * bm.get(i, 0.0) + 0.35 * em.get(i, 0.0)
-
-    # 3) Soft boosts/penalties
-    scored = []
-    for i, d in enumerate(cands):
-        s = base.get(i, 0.0)
-        conf = (d.get("label_confidence") or "LOW").upper()
-        conf_w = 1.0 if conf == "HIGH" else (0.9 if conf == "MEDIUM" else 0.8)
-        s *= conf_w
-
-        if targets:
-            if d.get("repaired_ticker") in targets:
-                s *= 1.25
-            if any(t in targets for t in (d.get("detected_tickers") or [])):
-                s *= 1.10
-            in_title, in_text = _alias_hit(d["title"], d["text"], list(targets)[0])
-            if in_title:
-                s *= 1.10
-            elif in_text:
-                s *= 1.05
-
+        rows = np.arange(len(docs))
+
+    # 2) Base scores (hybrid): each side's top 50, normalized to [0,1] and
+    #    scattered into one array over the candidates
+    base = np.zeros(len(rows), dtype=np.float64)
+    for (pos, vals), weight in (
+        (_bm25_topk(index["bm25"], rows, query, k=50), 0.55),
+        (_embed_topk(index["emb"], rows, query, k=50), 0.35),
+    ):
+        if len(vals):
+            base[pos] += weight * (vals / vals.max())
+
+    # 3) Soft boosts/penalties, one vectorized factor at a time over the
+    #    candidate rows (same multiplication order as the per-doc rules)
+    attrs = index["attrs"]
+    scores = base * attrs["conf_w"][rows]
+    if targets:
+        def hit(field: str, tickers) -> np.ndarray:
+            lists = [by_ticker[field][t] for t in tickers if t in by_ticker[field]]
+            return np.isin(rows, np.concatenate(lists)) if lists else np.zeros(len(rows), dtype=bool)
+
+        # Title/text alias hits only count for the (first) target
+        primary = (next(iter(targets)),)
+        det_hit = hit("detected", targets)
+        scores *= np.where(hit("repaired", targets), 1.25, 1.0)
+        scores *= np.where(det_hit, 1.10, 1.0)
+        scores *= np.where(
+            hit("alias_in_title", primary), 1.10, np.where(hit("alias_in_text", primary), 1.05, 1.0)
+        )
         # Penalize MISC unless query is clearly general-market
-        rt = (d.get("repaired_ticker") or "").upper()
-        if rt == "MISC" and targets:
-            s *= 0.85
-        if (
-            rt == "MULTI"
-            and targets
-            and not any(t in targets for t in (d.get("detected_tickers") or []))
-        ):
-            s *= 0.9
-
-        # optional: mild recency by order_index (newer = higher)
-        if "order_index" in d and len(docs) > 1:
-            r = 1.0 - (d["order_index"] / max(len(docs) - 1, 1))
-            s *= 1.0 + 0.05 * r
+        scores *= np.where(attrs["misc"][rows], 0.85, 1.0)
+        scores *= np.where(attrs["multi"][rows] & ~det_hit, 0.9, 1.0)
 
-        if s > 0:
-            scored.append((s, d))
+    # optional: mild recency by order_index (newer = higher)
+    scores *= attrs["recency"][rows]
 
-    scored.sort(key=lambda x: x[0], reverse=True)
+    pos = np.flatnonzero(scores > 0)
+    ranked = pos[np.argsort(-scores[pos], kind="stable")]
 
     # 4) Ensure variety across doc ids/titles (dedupe)
     seen_ids, out = set(), []
-    for s, d in scored:
+    for i in ranked:
+        d = docs[rows[i]]
         if d["id"] in seen_ids:
             continue
         out.append(d)
@@ -6,11 +6,25 @@ confidence label, and outputs cleaned/filtered JSON plus a CSV report.
 """
 
 import argparse
+import csv
 import json
+import os
 import re
 from collections import defaultdict
 from pathlib import Path
 
+# Optional C-backed Aho-Corasick automaton for alias scanning
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional C-backed JSON encoder for the (large) output files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # -------- Alias map (extend as needed) --------
 ALIAS_TO_TICKER = {
     # Big Tech
@@ -45,9 +59,11 @@ ALIAS_TO_TICKER = {
     "boeing": "BA",
 }
 
-# Regex to catch inline tickers like (AAPL), AAPL:, or [AAPL]
-TICKER_CANDIDATE_RE = re.compile(r"[\(\[\s,:\-](?P<tic>[A-Z]{2,5})[\)\]\s,:\-]")
-IGNORE_TOKENS = {
+# Regex to catch inline tickers like (AAPL), AAPL:, or [AAPL]. Start/end of
+# text count as delimiters, so callers scan the text as-is (no padded copy);
+# delimiters stay consuming so back-to-back candidates behave as before.
+TICKER_CANDIDATE_RE = re.compile(r"(?:^|[\(\[\s,:\-])(?P<tic>[A-Z]{2,5})(?:[\)\]\s,:\-]|\Z)")
+IGNORE_TOKENS = frozenset({
     "USD",
     "CEO",
     "AI",
@@ -62,7 +78,7 @@ IGNORE_TOKENS = {
     "EV",
     "ADP",
     "CPI",
-}
+})
 
 PERSONAL_FINANCE_HINTS = [
     "personal finance",
@@ -126,14 +142,80 @@ NEWS_TERMS = [
 ]
 
 
-def looks_personal_finance(title: str, text: str) -> bool:
-    blob = f"{title} {text}".lower()
-    return any(h in blob for h in PERSONAL_FINANCE_HINTS)
+def looks_personal_finance(low: str) -> bool:
+    """`low` is the lowercased title + text blob."""
+    return any(h in low for h in PERSONAL_FINANCE_HINTS)
+
+
+def looks_company_news(low: str) -> bool:
+    """`low` is the lowercased title + text blob."""
+    return any(term in low for term in NEWS_TERMS)
+
+
+# Category tags stored on the combined automaton; alias tags are
+# (alias_len, ticker) tuples
+_PF, _NEWS = "pf", "news"
+
+
+def _build_signal_matcher():
+    """One automaton over personal-finance hints, news terms and aliases, or
+    precompiled per-alias word-boundary regexes when pyahocorasick is missing."""
+    if ahocorasick is None:
+        return None, [
+            (re.compile(rf"\b{re.escape(alias)}\b"), ticker)
+            for alias, ticker in ALIAS_TO_TICKER.items()
+        ]
+    tags = defaultdict(list)
+    for h in PERSONAL_FINANCE_HINTS:
+        tags[h].append(_PF)
+    for term in NEWS_TERMS:
+        tags[term].append(_NEWS)
+    for alias, ticker in ALIAS_TO_TICKER.items():
+        tags[alias].append((len(alias), ticker))
+    ac = ahocorasick.Automaton()
+    for word, word_tags in tags.items():
+        ac.add_word(word, tuple(word_tags))
+    ac.make_automaton()
+    return ac, None
+
+
+_SIGNAL_AC, _ALIAS_RES = _build_signal_matcher()
+
+
+def _is_word_char(ch: str) -> bool:
+    # same notion of a word character as the regex `\b`
+    return ch.isalnum() or ch == "_"
 
 
-def looks_company_news(title: str, text: str) -> bool:
-    blob = f"{title} {text}".lower()
-    return any(term in blob for term in NEWS_TERMS)
+def scan_signals(low: str):
+    """Return (personal_finance, company_news, alias_tickers) for a lowercased blob.
+
+    With pyahocorasick this is a single pass over `low`; hints and news terms
+    are plain substring hits, aliases must sit on word boundaries.
+    """
+    if _SIGNAL_AC is None:
+        hits = {ticker for alias_re, ticker in _ALIAS_RES if alias_re.search(low)}
+        return looks_personal_finance(low), looks_company_news(low), hits
+    pf = news = False
+    hits = set()
+    n = len(low)
+    for end, word_tags in _SIGNAL_AC.iter(low):
+        for tag in word_tags:
+            if tag is _PF:
+                pf = True
+            elif tag is _NEWS:
+                news = True
+            else:
+                # boundaries checked on the reported offsets (every alias
+                # starts and ends with a word character)
+                length, ticker = tag
+                start = end - length + 1
+                if start > 0 and _is_word_char(low[start - 1]):
+                    continue
+                if end + 1 < n and _is_word_char(low[end + 1]):
+                    continue
+                hits.add(ticker)
+    return pf, news, hits
 
 
 def alias_hits(text_lower: str):
@@ -141,12 +223,7 @@ def alias_hits(text_lower: str):
 
     `text_lower` should already be lowercase; alias keys are lowercase as well.
     """
-    hits = set()
-    for alias, ticker in ALIAS_TO_TICKER.items():
-        # word-boundary-ish match against the already-lowercased blob
-        if re.search(rf"\b{re.escape(alias)}\b", text_lower):
-            hits.add(ticker)
-    return hits
+    return scan_signals(text_lower)[2]
 
 
 def detect_tickers_from_text(text: str, known_tickers=None):
@@ -155,29 +232,25 @@ def detect_tickers_from_text(text: str, known_tickers=None):
     If `known_tickers` is provided, only return tickers present in that set.
     The returned tickers are uppercase as matched by the regex.
     """
-    found = set()
     # normalize known tickers to uppercase for comparison
-    kt = {t.upper() for t in (known_tickers or [])}
-    for m in TICKER_CANDIDATE_RE.finditer(f" {text} "):
-        tic = m.group("tic")
-        if tic in IGNORE_TOKENS:
-            continue
-        if kt and tic not in kt:
-            continue
-        found.add(tic)
-    return found
+    kt = frozenset(t.upper() for t in (known_tickers or ()))
+    return {
+        tic
+        for tic in (m.group("tic") for m in TICKER_CANDIDATE_RE.finditer(text))
+        if tic not in IGNORE_TOKENS and (not kt or tic in kt)
+    }
 
 
 def repair_and_flag(orig_ticker: str, title: str, full_text: str, known_tickers=None):
-    blob = f"{title}\n{full_text}".strip()
+    # One blob, lowercased once, feeds every signal. A space separator keeps
+    # hint/term matching identical to the old per-helper blobs; aliases and
+    # inline tickers treat any whitespace as a boundary.
+    blob = f"{title} {full_text}"
     low = blob.lower()
 
-    alias_set = alias_hits(low)
+    pf, news, alias_set = scan_signals(low)
     inline_set = detect_tickers_from_text(blob, known_tickers=known_tickers)
 
-    pf = looks_personal_finance(title, full_text)
-    news = looks_company_news(title, full_text)
-
     # Decision policy
     # 1) Prefer single explicit company alias
     if orig_ticker and orig_ticker in alias_set and len(alias_set) == 1 and news:
@@ -219,27 +292,92 @@ def repair_and_flag(orig_ticker: str, title: str, full_text: str, known_tickers=
     return repaired, conf, detected, reason
 
 
-def process(in_path: str, out_clean: str, out_filtered: str, report_csv: str):
+# Known tickers for pool workers, installed once per process by
+# `_init_worker` instead of being pickled with every task
+_KNOWN_TICKERS = None
+
+# Docs per pool task; inputs no larger than this are cleaned in-process
+POOL_CHUNKSIZE = 64
+
+
+def _init_worker(known_tickers):
+    global _KNOWN_TICKERS
+    _KNOWN_TICKERS = known_tickers
+
+
+def _repair_worker(task):
+    orig_ticker, title, text = task
+    return repair_and_flag(orig_ticker, title, text, known_tickers=_KNOWN_TICKERS)
+
+
+def _repair_all(tasks, known_tickers, workers: int):
+    """repair_and_flag over (orig_ticker, title, text) tasks, results in input order."""
+    if workers <= 1 or len(tasks) <= POOL_CHUNKSIZE:
+        _init_worker(known_tickers)
+        return [_repair_worker(t) for t in tasks]
+    # Each doc is independent; imap keeps submission order
+    from multiprocessing import Pool
+
+    with Pool(workers, initializer=_init_worker, initargs=(known_tickers,)) as pool:
+        return list(pool.imap(_repair_worker, tasks, chunksize=POOL_CHUNKSIZE))
+
+
+# Column order of the CSV report (one row per input item)
+REPORT_FIELDNAMES = (
+    "id",
+    "orig_ticker",
+    "repaired_ticker",
+    "label_confidence",
+    "detected_tickers",
+    "reason",
+    "title",
+    "full_text",
+    "link",
+    "order_index",
+)
+
+
+def _write_json(path: str, obj) -> None:
+    """Write `obj` as indented UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        Path(path).write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def process(in_path: str, out_clean: str, out_filtered: str, report_csv: str, workers: int = None):
     raw = json.loads(Path(in_path).read_text())
     cleaned = defaultdict(list)
-    report_rows = []
-    order_index = 0
 
     # Build a set of known tickers (normalize to uppercase for matching inline tokens)
-    known_tickers = {k.upper() for k in set(raw.keys())} | {
+    known_tickers = frozenset({k.upper() for k in set(raw.keys())} | {
         v.upper() for v in set(ALIAS_TO_TICKER.values())
-    }
-
-    for orig_ticker, items in raw.items():
-        for it in items:
-            title = (it.get("title") or "").strip()
-            text = (it.get("full_text") or "").strip()
-            link = (it.get("link") or "").strip()
-
-            repaired_ticker, conf, detected, reason = repair_and_flag(
-                orig_ticker, title, text, known_tickers=known_tickers
-            )
+    })
+
+    items = [
+        (
+            orig_ticker,
+            (it.get("title") or "").strip(),
+            (it.get("full_text") or "").strip(),
+            (it.get("link") or "").strip(),
+        )
+        for orig_ticker, bucket in raw.items()
+        for it in bucket
+    ]
+    results = _repair_all(
+        [(orig_ticker, title, text) for orig_ticker, title, text, _ in items],
+        known_tickers,
+        workers or os.cpu_count() or 1,
+    )
 
+    # CSV report rows are streamed as records are built; an empty input
+    # leaves an empty file (no header)
+    with open(report_csv, "w", newline="", encoding="utf-8") as report:
+        w = csv.DictWriter(report, fieldnames=REPORT_FIELDNAMES)
+        if items:
+            w.writeheader()
+        for order_index, ((orig_ticker, title, text, link), result) in enumerate(zip(items, results)):
+            repaired_ticker, conf, detected, reason = result
             rec = {
                 "id": f"{repaired_ticker}-{order_index}",
                 "orig_ticker": orig_ticker,
@@ -253,10 +391,9 @@ def process(in_path: str, out_clean: str, out_filtered: str, report_csv: str):
                 "order_index": order_index,
             }
             cleaned[repaired_ticker].append(rec)
-            report_rows.append(rec | {"detected_tickers": ",".join(detected)})
-            order_index += 1
+            w.writerow(rec | {"detected_tickers": ",".join(detected)})
 
-    Path(out_clean).write_text(json.dumps(cleaned, ensure_ascii=False, indent=2))
+    _write_json(out_clean, cleaned)
 
     filtered = {
         k: [
@@ -267,19 +404,7 @@ def process(in_path: str, out_clean: str, out_filtered: str, report_csv: str):
         ]
         for k, v in cleaned.items()
     }
-    Path(out_filtered).write_text(json.dumps(filtered, ensure_ascii=False, indent=2))
-
-    # CSV report (only write if we have rows)
-    import csv
-
-    if report_rows:
-        with open(report_csv, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=list(report_rows[0].keys()))
-            w.writeheader()
-            w.writerows(report_rows)
-    else:
-        # Avoid raising if input dataset was empty
-        Path(report_csv).write_text("")
+    _write_json(out_filtered, filtered)
 
 
 def main():
@@ -302,9 +427,15 @@ def main():
     ap.add_argument(
         "--report", dest="report_csv", required=True, help="Path to write CSV report"
     )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for labeling (default: CPU count; 1 disables the pool)",
+    )
     args = ap.parse_args()
 
-    process(args.inp, args.out_clean, args.out_filtered, args.report_csv)
+    process(args.inp, args.out_clean, args.out_filtered, args.report_csv, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,53 @@
 """Entrypoint for running the FastAPI app with Uvicorn."""
 
+import logging
+import os
+
 import uvicorn
 
+from app.deps import defers_fact_checks
+
+logger = logging.getLogger(__name__)
+
+# NEWS_DEV=0 switches to the production server settings below
+DEV = os.getenv("NEWS_DEV", "1") != "0"
+
+
+def _workers() -> int:
+    """Worker processes for the production server.
+
+    When the fact-check runs after /chat returns (see defers_fact_checks) its
+    verdict lives in that worker's memory (/chat/{request_id}/factcheck), so
+    polls must reach the same process: one worker then.
+    """
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    if workers > 1 and defers_fact_checks():
+        logger.warning(
+            "fact-checks are deferred and kept per-process: using 1 worker instead of %d", workers
+        )
+        return 1
+    return workers
+
+
 def main():
     """The main function."""
     # lets you run the app with `python main.py`
     # uvicorn.run(app, host="0.0.0.0", port=8000)
+    if DEV:
+        uvicorn.run(
+            "app.main:app", host="127.0.0.1", port=8000, log_level="debug", reload=True, workers=1
+        )
+        return
+    # Production: uvloop + httptools (both ship with uvicorn[standard]) and one
+    # worker process per core unless WEB_CONCURRENCY says otherwise (see _workers)
     uvicorn.run(
-        "app.main:app", host="127.0.0.1", port=8000, log_level="debug", reload=True
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=_workers(),
+        reload=False,
     )
 
 if __name__ == "__main__":
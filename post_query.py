@@ -1,6 +1,14 @@
 """Example script to query the FastAPI server."""
-import requests
+import asyncio
 
-r = requests.post("http://localhost:8000/chat",
-                  json={"question": "What’s up with AAPL in China?"})
-print(r.status_code, r.json())
\ No newline at end of file
+import httpx
+
+
+async def main():
+    async with httpx.AsyncClient(base_url="http://localhost:8000", timeout=45) as client:
+        r = await client.post("/chat", json={"question": "What’s up with AAPL in China?"})
+        print(r.status_code, r.json())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session", autouse=True)
+def mock_llm_provider():
+    """Force MockLLM for the session; tests that need another provider monkeypatch it."""
+    mp = pytest.MonkeyPatch()
+    mp.setenv("LLM_PROVIDER", "mock")
+    yield
+    mp.undo()
+
+
+@pytest.fixture(scope="session")
+def client(mock_llm_provider):
+    """One TestClient for the whole session, with docs and index built up front."""
+    from app.deps import get_index
+    from app.main import app
+
+    get_index()
+    c = TestClient(app)
+    c.get("/healthz")
+    return c
@@ -125,6 +125,16 @@ def test_iso_now_format_and_z_suffix():
     assert s.endswith("Z")  # timezone 'Z'
 
 
+def test_iso_now_tracks_the_clock_across_seconds(monkeypatch):
+    from datetime import datetime
+
+    ticks = iter([1_700_000_000_123_000_000, 1_700_000_000_999_000_000, 1_700_000_001_004_000_000])
+    monkeypatch.setattr("app.agents.time.time_ns", lambda: next(ticks))
+    stamps = [AuditLoggerAgent._iso_now() for _ in range(3)]
+    assert stamps == ["2023-11-14T22:13:20.123Z", "2023-11-14T22:13:20.999Z", "2023-11-14T22:13:21.004Z"]
+    datetime.strptime(stamps[0], "%Y-%m-%dT%H:%M:%S.%fZ")
+
+
 def test_build_and_log_writes_entry_and_context_hash(tmp_path):
     log_file = tmp_path / "audit.log"
     agent = AuditLoggerAgent(log_path=str(log_file))
@@ -154,6 +164,7 @@ def test_build_and_log_writes_entry_and_context_hash(tmp_path):
         extra=extra,
         started_monotonic=started_monotonic,
     )
+    agent.flush()
 
     # file should exist and contain one JSON line
     assert log_file.exists()
@@ -173,8 +184,15 @@ def test_build_and_log_writes_entry_and_context_hash(tmp_path):
     assert "order_index" in rec["retrieved"][0]
     assert rec["retrieved"][0]["order_index"] == 0
 
-    # context hash matches
-    expected_hash = hashlib.sha256(context.encode("utf-8")).hexdigest()
+    # context hash matches the algorithm named in the record
+    data = context.encode("utf-8")
+    if rec["hash_algo"] == "xxh3_64":
+        import xxhash
+
+        expected_hash = xxhash.xxh3_64_hexdigest(data)
+    else:
+        assert rec["hash_algo"] == "blake2b-64"
+        expected_hash = hashlib.blake2b(data, digest_size=8).hexdigest()
     assert rec["context_hash"] == expected_hash
 
     # extra preserved
@@ -182,4 +200,91 @@ def test_build_and_log_writes_entry_and_context_hash(tmp_path):
 
     # elapsed_ms is an integer >= 0
     assert isinstance(rec["elapsed_ms"], int)
-    assert rec["elapsed_ms"] >= 0
\ No newline at end of file
+    assert rec["elapsed_ms"] >= 0
+
+def test_log_batches_records_from_many_threads(tmp_path):
+    import threading
+
+    log_file = tmp_path / "audit.log"
+    agent = AuditLoggerAgent(log_path=str(log_file))
+
+    def worker(n):
+        for i in range(50):
+            agent.log({"thread": n, "i": i})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    agent.close()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 200
+    assert all(json.loads(ln)["i"] < 50 for ln in lines)
+
+    # records after close are dropped, not raised
+    agent.log({"late": True})
+    assert len(log_file.read_text(encoding="utf-8").splitlines()) == 200
+
+
+def test_acheck_uses_async_llm_client():
+    import asyncio
+
+    class AsyncRealLLM:
+        def complete(self, prompt: str, system: str = None) -> str:
+            raise AssertionError("sync path should not be used")
+
+        async def acomplete(self, prompt: str, system: str = None) -> str:
+            return json.dumps({"verdict": "PASS", "unsupported_claims": [], "confidence": 0.8, "notes": "ok"})
+
+    res = asyncio.run(FactCheckAgent(AsyncRealLLM()).acheck("Q", "A", "C"))
+    assert res["verdict"] == "PASS"
+    assert abs(res["confidence"] - 0.8) < 1e-6
+
+
+def test_split_combined_reply():
+    answer, fc = FactCheckAgent.split_combined(
+        '{"answer": " Apple beat. ", "fact_check": {"verdict": "WARN", "unsupported_claims": "x", "confidence": 0.4}}'
+    )
+    assert answer == "Apple beat."
+    assert fc == {"verdict": "WARN", "unsupported_claims": ["x"], "confidence": 0.4, "notes": ""}
+
+    # plain text (no JSON mode) is the answer; fact-check left to the verifier
+    assert FactCheckAgent.split_combined("Apple beat.") == ("Apple beat.", None)
+    assert FactCheckAgent.split_combined('{"answer": "A", "fact_check": "PASS"}') == ("A", None)
+    # JSON without a usable answer is never shown raw; the caller asks again
+    assert FactCheckAgent.split_combined('{"fact_check": {"verdict": "PASS"}}') == (None, None)
+    assert FactCheckAgent.split_combined('{"answer": 42}') == (None, None)
+
+
+def test_extract_json_span_ignores_braces_in_strings_and_trailing_text():
+    from app.agents import _extract_json_span
+
+    raw = 'Verdict: {"verdict": "PASS", "notes": "uses } and { in text"} (see {appendix})'
+    a, b = _extract_json_span(raw)
+    assert json.loads(raw[a:b])["notes"] == "uses } and { in text"
+    assert _extract_json_span("no json here") == (-1, -1)
+
+
+def test_audit_record_with_wide_int_is_still_written(tmp_path):
+    log_file = tmp_path / "audit.log"
+    agent = AuditLoggerAgent(log_path=str(log_file))
+    agent.log({"fact_check": {"confidence": 2**70}})
+    agent.close()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0])["fact_check"]["confidence"] == 2**70
+
+
+def test_unencodable_record_does_not_lose_its_batch(tmp_path):
+    log_file = tmp_path / "audit.log"
+    agent = AuditLoggerAgent(log_path=str(log_file))
+    for i in range(100):
+        agent.log({"i": i})
+    agent.log({"bad": object()})
+    agent.close()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 100
+    assert agent.dropped == 1
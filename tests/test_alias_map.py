@@ -0,0 +1,12 @@
+from app.alias_map import detect_tickers_from_query
+
+
+def test_detect_tickers_from_query_matches_aliases():
+    assert detect_tickers_from_query("What's new with Apple this quarter?") == {"AAPL"}
+    assert detect_tickers_from_query("AWS and Azure cloud deals") == {"AMZN", "MSFT"}
+    assert detect_tickers_from_query("How did the market close?") == set()
+
+
+def test_detect_tickers_from_query_reports_overlapping_aliases():
+    # "mac" is a substring of "machines"; both tickers are reported
+    assert detect_tickers_from_query("International Business Machines") == {"AAPL", "IBM"}
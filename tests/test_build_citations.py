@@ -0,0 +1,29 @@
+from app.main import _build_citations
+
+
+def _hit(title, ticker, detected=None):
+    return {
+        "title": title,
+        "link": f"https://example.com/{title}",
+        "repaired_ticker": ticker,
+        "detected_tickers": detected or [],
+    }
+
+
+def test_build_citations_prefers_targets_and_limits_backfill():
+    hits = [
+        _hit("misc", "MISC"),
+        _hit("apple-1", "AAPL"),
+        _hit("multi", "MULTI", ["AAPL", "MSFT"]),
+        _hit("apple-1", "AAPL"),  # duplicate
+        _hit("ibm", "IBM"),
+    ]
+    out = _build_citations(hits, {"AAPL"}, max_items=4, max_non_target=1)
+    assert [c["title"] for c in out] == ["apple-1", "multi", "misc"]
+    assert out[0]["ticker"] == "AAPL"
+
+
+def test_build_citations_without_targets_keeps_hit_order():
+    hits = [_hit("a", "AAPL"), _hit("b", "IBM"), _hit("c", "MSFT")]
+    out = _build_citations(hits, set(), max_items=2)
+    assert [c["title"] for c in out] == ["a", "b"]
@@ -0,0 +1,104 @@
+import time
+
+from app.cache import AnswerCache, normalize_question
+
+
+def test_normalize_question_collapses_case_and_punctuation():
+    assert normalize_question("  What's new with APPLE?? ") == "what's new with apple"
+
+
+def test_exact_hit_is_scoped_by_targets_and_provider():
+    cache = AnswerCache(maxsize=4)
+    cache.put("What's new with Apple?", {"AAPL"}, "mock", "answer-1")
+    assert cache.get("what's new with apple", {"AAPL"}, "mock") == "answer-1"
+    assert cache.get("what's new with apple", {"AAPL"}, "openai") is None
+    assert cache.get("what's new with apple", set(), "mock") is None
+
+
+def test_semantic_hit_requires_near_identical_tokens():
+    cache = AnswerCache(maxsize=4, threshold=0.9)
+    q = "summarize recent amazon cloud ai announcements and partnerships this quarter"
+    cache.put(q, {"AMZN"}, "mock", "answer")
+    assert cache.get(q + " please", {"AMZN"}, "mock") == "answer"
+    assert cache.get("amazon layoffs", {"AMZN"}, "mock") is None
+
+
+def test_semantic_tier_respects_word_order_negation_and_numbers():
+    cache = AnswerCache(maxsize=8)
+    cache.put("Did Amazon outperform Microsoft?", {"AMZN", "MSFT"}, "mock", "amazon-won")
+    assert cache.get("Did Microsoft outperform Amazon?", {"AMZN", "MSFT"}, "mock") is None
+
+    long_q = (
+        "what did apple say about iphone sales growth in china and the impact "
+        "of tariffs on margins during the most recent earnings call with analysts"
+    )
+    cache.put(long_q, {"AAPL"}, "mock", "answer")
+    assert cache.get(long_q.replace("growth", "decline"), {"AAPL"}, "mock") is None
+    assert cache.get(long_q.replace("apple say", "apple not say"), {"AAPL"}, "mock") is None
+    assert cache.get(long_q.replace("recent", "recent 2023"), {"AAPL"}, "mock") is None
+    assert cache.get(long_q + " please", {"AAPL"}, "mock") == "answer"
+
+
+def test_non_ascii_questions_get_distinct_keys():
+    cache = AnswerCache(maxsize=8)
+    cache.put("苹果最新消息是什么？", set(), "mock", "answer about apple")
+    assert cache.get("特斯拉的交付量如何？", set(), "mock") is None
+    assert cache.get("苹果最新消息是什么?", set(), "mock") == "answer about apple"
+
+    cache.put("Apple 新闻?", {"AAPL"}, "mock", "apple news")
+    assert cache.get("Apple 股价?", {"AAPL"}, "mock") is None
+
+    # nothing left after normalization: never cached, never matched
+    cache.put("？？", set(), "mock", "junk")
+    assert cache.get("!!", set(), "mock") is None
+
+
+def test_lru_eviction_and_bind_invalidation():
+    cache = AnswerCache(maxsize=2)
+    cache.bind(object())
+    for i in range(3):
+        cache.put(f"question number {i}", set(), "mock", i)
+    assert cache.get("question number 0", set(), "mock") is None
+    assert cache.get("question number 2", set(), "mock") == 2
+    cache.bind(object())
+    assert cache.get("question number 2", set(), "mock") is None
+
+
+def test_disabled_cache_never_hits():
+    cache = AnswerCache(maxsize=0)
+    cache.put("q", set(), "mock", "a")
+    assert cache.get("q", set(), "mock") is None
+
+
+def test_retriever_cache_reuses_hits_until_index_changes():
+    from app.cache import RetrieverCache
+
+    calls = []
+
+    def compute(index, query, k):
+        calls.append((query, k))
+        return [{"id": f"{query}-{i}"} for i in range(k)]
+
+    cache = RetrieverCache(maxsize=8)
+    idx = object()
+    first = cache.retrieve(idx, "apple earnings", 2, compute)
+    assert cache.retrieve(idx, "apple earnings", 2, compute) == first
+    cache.retrieve(idx, "apple earnings", 3, compute)
+    assert len(calls) == 2
+
+    cache.retrieve(object(), "apple earnings", 2, compute)
+    assert len(calls) == 3
+
+
+def test_factcheck_store_expires_entries(monkeypatch):
+    from app.cache import FactCheckStore
+
+    store = FactCheckStore(maxsize=2, ttl=10.0)
+    store.put("r1", {"verdict": "PENDING"})
+    store.put("r1", {"verdict": "PASS"})
+    assert store.get("r1") == {"verdict": "PASS"}
+    assert store.get("missing") is None
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now + 11.0)
+    assert store.get("r1") is None
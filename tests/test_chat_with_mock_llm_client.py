@@ -1,12 +1,7 @@
-from fastapi.testclient import TestClient
-
 from app.llm import MockLLM
-from app.main import app
-
-client = TestClient(app)
 
 
-def test_chat_endpoint_monkeypatched_llm(monkeypatch):
+def test_chat_endpoint_monkeypatched_llm(client, monkeypatch):
     """
     Replace get_llm() with a factory that returns MockLLM so the /chat endpoint
     replies deterministically during the test.
@@ -7,13 +7,10 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from fastapi.testclient import TestClient
-from app.main import app
 
-
-def test_debug_dumps_created(monkeypatch, tmp_path):
+def test_debug_dumps_created(client, monkeypatch, tmp_path):
     # Monkeypatch retrieve to return deterministic hits
-    def fake_retrieve(idx, q, k=8):
+    def fake_retrieve(idx, q, k=8, targets=None):
         return [
             {"id": "1", "title": "A", "link": "u1", "text": "t1"},
             {"id": "2", "title": "B", "link": "u2", "text": "t2"},
@@ -21,11 +18,12 @@ def test_debug_dumps_created(monkeypatch, tmp_path):
         ]
 
     monkeypatch.setattr("app.main.retrieve", fake_retrieve)
+    # debug dumps are opt-in (NEWS_DEBUG_DUMP), resolved at import
+    monkeypatch.setattr("app.main._DEBUG_DUMP", True)
 
     # ensure /tmp paths point to tmp_path for safety in test environment
     monkeypatch.setenv("TMPDIR", str(tmp_path))
 
-    client = TestClient(app)
     resp = client.post("/chat", json={"question": "Any recent IBM partnerships mentioned?"})
     assert resp.status_code == 200
 
@@ -42,3 +40,19 @@ def test_debug_dumps_created(monkeypatch, tmp_path):
             break
 
     assert found, f"Expected debug dump files to exist in {candidates}"
+
+
+def test_debug_last_hits_ring_buffer(client, monkeypatch):
+    from app.main import debug_last_hits
+
+    # not exposed without NEWS_DEBUG_DUMP
+    assert client.get("/debug/last_hits").status_code == 404
+
+    monkeypatch.setattr("app.main._DEBUG_DUMP", True)
+    resp = client.post("/chat", json={"question": "What did Nvidia announce recently?"})
+    assert resp.status_code == 200
+
+    last = debug_last_hits()
+    assert 1 <= len(last) <= 8
+    # only (id, title, link) per hit; questions are never recorded
+    assert all(set(h) == {"id", "title", "link"} for h in last[-1])
@@ -0,0 +1,52 @@
+import json
+import os
+
+from app.deps import _NewsSnapshot
+
+
+def test_news_snapshot_reloads_when_file_changes(tmp_path):
+    p = tmp_path / "news.json"
+    p.write_text(json.dumps({"AAPL": [{"title": "One", "full_text": "a", "link": "u1"}]}))
+    snap = _NewsSnapshot(str(p))
+
+    docs, idx = snap.docs(), snap.index()
+    assert len(docs) == 1
+    # unchanged file -> same cached objects
+    assert snap.docs() is docs and snap.index() is idx
+
+    p.write_text(json.dumps({"AAPL": [
+        {"title": "One", "full_text": "a", "link": "u1"},
+        {"title": "Two", "full_text": "b", "link": "u2"},
+    ]}))
+    st = os.stat(p)
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert len(snap.docs()) == 2
+    assert snap.index() is not idx
+
+
+def test_get_llm_is_cached_per_environment(monkeypatch):
+    from app.deps import get_llm, reset_llm_cache
+    from app.llm import MockLLM
+
+    reset_llm_cache()
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    first = get_llm()
+    assert isinstance(first, MockLLM)
+    assert get_llm() is first
+
+    monkeypatch.setenv("OPENAI_MODEL", "some-other-model")
+    assert get_llm() is not first
+    reset_llm_cache()
+
+
+def test_defers_fact_checks_only_without_combined_json_mode(monkeypatch):
+    from app.deps import defers_fact_checks
+
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    assert defers_fact_checks() is False
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.delenv("COMBINED_LLM", raising=False)
+    assert defers_fact_checks() is False
+    monkeypatch.setenv("COMBINED_LLM", "0")
+    assert defers_fact_checks() is True
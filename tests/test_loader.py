@@ -48,3 +48,25 @@ def test_load_original_schema(tmp_path):
     docs = load_news(str(p))
     assert docs[0]["ticker"] == "AAPL"
     assert docs[0]["text"] == "Some text"
+
+
+def test_load_news_reuses_parse_until_file_changes(tmp_path):
+    p = tmp_path / "news.json"
+    p.write_text(json.dumps({"AAPL": [{"title": "One", "full_text": "a", "link": "u1"}]}))
+    first = load_news(str(p))
+    again = load_news(str(p))
+    assert again == first and again[0] is first[0]
+
+    p.write_text(json.dumps({"AAPL": [{"title": "Two", "full_text": "bb", "link": "u2"}]}))
+    assert load_news(str(p))[0]["title"] == "Two"
+
+
+def test_load_news_cache_keeps_only_recent_files(tmp_path):
+    from app import data_loader
+
+    for i in range(data_loader._LOAD_CACHE_MAX + 2):
+        p = tmp_path / f"news{i}.json"
+        p.write_text(json.dumps({"AAPL": [{"title": f"T{i}", "full_text": "a", "link": "u"}]}))
+        load_news(str(p))
+    assert len(data_loader._LOAD_CACHE) == data_loader._LOAD_CACHE_MAX
+    assert os.path.realpath(str(tmp_path / "news0.json")) not in data_loader._LOAD_CACHE
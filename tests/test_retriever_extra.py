@@ -41,3 +41,25 @@ def test_format_context_contains_title_and_link():
     out = format_context(hits)
     assert "[" in out and "]" in out
     assert "CONTEXT:" in out and "https://example.com/a" in out
+
+
+def test_retrieve_uses_caller_supplied_targets():
+    docs = [
+        {"id": "a1", "title": "Apple earnings beat", "text": "iPhone sales", "repaired_ticker": "AAPL", "label_confidence": "HIGH"},
+        {"id": "m1", "title": "Microsoft earnings beat", "text": "Azure growth", "repaired_ticker": "MSFT", "label_confidence": "HIGH"},
+    ]
+    idx = build_index(docs)
+    # "earnings" alone has no ticker; passing targets narrows the pool
+    assert [d["id"] for d in retrieve(idx, "earnings beat", k=2, targets={"MSFT"})] == ["m1"]
+    assert retrieve(idx, "apple earnings", k=2) == retrieve(idx, "apple earnings", k=2, targets={"AAPL"})
+
+
+def test_bm25_prefers_rarer_query_terms():
+    docs = [
+        {"id": "d1", "title": "Market update", "text": "stocks market market market", "label_confidence": "HIGH"},
+        {"id": "d2", "title": "Chip shortage", "text": "market shortage of chips", "label_confidence": "HIGH"},
+        {"id": "d3", "title": "Market wrap", "text": "market closes flat", "label_confidence": "HIGH"},
+    ]
+    idx = build_index(docs)
+    # "shortage" is rare, "market" is everywhere
+    assert retrieve(idx, "market shortage", k=3)[0]["id"] == "d2"
@@ -2,7 +2,7 @@ from types import SimpleNamespace
 
 import requests
 
-from ui.app import ask_news
+from ui.client import ask_news
 
 
 class DummyResp:
@@ -26,7 +26,7 @@ def test_ask_news_success(monkeypatch):
             },
         )
 
-    monkeypatch.setattr("ui.app.requests.post", fake_post)
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
     answer, citations_md, fact_md  = ask_news("What’s new with Apple this quarter?")
     assert "Test answer" in answer
     assert "[T1](https://u)" in citations_md
@@ -38,7 +38,7 @@ def test_ask_news_http_error(monkeypatch):
     def fake_post(url, json, timeout):
         return DummyResp(500, None, "internal error")
 
-    monkeypatch.setattr("ui.app.requests.post", fake_post)
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
     answer, _, fact_md= ask_news("Some question")
     assert answer.startswith("Error: 500")
 
@@ -47,6 +47,42 @@ def test_ask_news_network_exception(monkeypatch):
     def fake_post(url, json, timeout):
         raise requests.RequestException("conn failed")
 
-    monkeypatch.setattr("ui.app.requests.post", fake_post)
-    answer, _ = ask_news("Some question")
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
+    answer, citations_md, fact_md = ask_news("Some question")
     assert answer.startswith("Network error calling")
+    assert citations_md == fact_md == "—"
+
+
+def test_ask_news_polls_pending_fact_check(monkeypatch):
+    def fake_post(url, json, timeout):
+        return DummyResp(
+            200,
+            {
+                "answer": "A",
+                "citations": [],
+                "fact_check": {"verdict": "PENDING", "confidence": 0.0},
+                "request_id": "abc",
+            },
+        )
+
+    def fake_get(url, timeout):
+        assert url.endswith("/chat/abc/factcheck")
+        return DummyResp(200, {"verdict": "PASS", "confidence": 0.9})
+
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
+    monkeypatch.setattr("ui.client._SESSION.get", fake_get)
+    monkeypatch.setattr("ui.client.time.sleep", lambda s: None)
+    _, _, fact_md = ask_news("Apple?")
+    assert "`PASS`" in fact_md
+
+
+def test_ask_news_parses_raw_body(monkeypatch):
+    body = b'{"answer": "Raw answer", "citations": [], "fact_check": {"verdict": "PASS", "confidence": 0.8}}'
+
+    def fake_post(url, json, timeout):
+        return SimpleNamespace(status_code=200, content=body, json=lambda: {"answer": "via json()"})
+
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
+    answer, _, fact_md = ask_news("Apple?")
+    assert answer == "Raw answer"
+    assert "`PASS`" in fact_md
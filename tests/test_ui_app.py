@@ -14,7 +14,7 @@ class DummyResp:
 
 
 def test_ask_news_success(monkeypatch):
-    from ui.app import ask_news
+    from ui.client import ask_news
 
     def fake_post(url, json, timeout):
         assert url.endswith("/chat")
@@ -26,7 +26,7 @@ def test_ask_news_success(monkeypatch):
             },
         )
 
-    monkeypatch.setattr("ui.app.requests.post", fake_post)
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
     answer, citations_md, fact_md = ask_news("What’s new with Apple this quarter?")
     assert "Test answer" in answer
     assert "Sources" in citations_md or "T1" in citations_md
@@ -34,22 +34,23 @@ def test_ask_news_success(monkeypatch):
 
 
 def test_ask_news_http_error(monkeypatch):
-    from ui.app import ask_news
+    from ui.client import ask_news
 
     def fake_post(url, json, timeout):
         return DummyResp(500, None, "internal error")
 
-    monkeypatch.setattr("ui.app.requests.post", fake_post)
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
     answer, _, fact_md = ask_news("Some question")
     assert answer.startswith("Error: 500")
 
 
 def test_ask_news_network_exception(monkeypatch):
-    from ui.app import ask_news
+    from ui.client import ask_news
 
     def fake_post(url, json, timeout):
         raise requests.RequestException("conn failed")
 
-    monkeypatch.setattr("ui.app.requests.post", fake_post)
-    answer, _ = ask_news("Some question")
+    monkeypatch.setattr("ui.client._SESSION.post", fake_post)
+    answer, citations_md, fact_md = ask_news("Some question")
     assert answer.startswith("Network error calling")
+    assert citations_md == fact_md == "—"
@@ -1,76 +1,17 @@
 """Small Gradio UI wrapper that calls the API `/chat` endpoint and renders
 the model answer and citations.
 
-This module is intentionally tiny: `ask_news` performs the HTTP call and
-formats a short markdown citations list for display in the UI.
+This module is intentionally tiny: `ask_news` (in `ui/client.py`) performs
+the HTTP call and formats a short markdown citations list for display here.
 """
 
-import os
-
 import gradio as gr
-import requests
-
-# API base used by the UI. Override with the NEWS_API_BASE env var.
-API_BASE = os.getenv("NEWS_API_BASE", "http://localhost:8000")
-
-
-def ask_news(question: str) -> tuple[str, str]:
-    """Query the backend `/chat` endpoint and return (answer, citations_md).
-
-    Returns a tuple of (answer_text, citations_markdown). On errors the answer
-    contains an explanatory message and citations_md is the literal "—".
-    """
-    question = (question or "").strip()
-    if not question:
-        return "Please enter a question about the provided news dataset.", "—", "—"
-
-    try:
-        resp = requests.post(
-            f"{API_BASE}/chat", json={"question": question}, timeout=45
-        )
-        if resp.status_code != 200:
-            return f"Error: {resp.status_code} {resp.text}", "—", "—"
-        try:
-            js = resp.json()
-        except ValueError:
-            # Non-JSON response from the API
-            return f"Error: non-JSON response from {API_BASE}/chat", "—", "—"
-
-        answer = js.get("answer", "").strip() or "(no answer)"
-        cits = js.get("citations", []) or []
-        fc = js.get("fact_check") or {}
-
-        # Build a friendly citations markdown
-        if cits:
-            lines = []
-            for i, c in enumerate(cits, 1):
-                t = c.get("title", "Untitled")
-                u = c.get("link", "#")
-                k = c.get("ticker", "")
-                suffix = f" — {k}" if k else ""
-                lines.append(f"{i}. [{t}]({u}){suffix}")
-            citations_md = "**Sources**\n\n" + "\n".join(lines)
-        else:
-            citations_md = "No sources returned."
-        
-        # Fact-check panel
-        verdict = (fc.get("verdict") or "—").upper()
-        conf = fc.get("confidence")
-        notes = fc.get("notes") or ""
-        uc = fc.get("unsupported_claims") or []
-        conf_s = f"{conf:.2f}" if isinstance(conf, (int, float)) else "—"
-
-        fact_md = f"**Fact-check verdict:** `{verdict}`  |  **confidence:** {conf_s}\n\n"
-        if notes:
-            fact_md += f"_Notes:_ {notes}\n\n"
-        if uc:
-            fact_md += "**Unsupported claims:**\n" + "\n".join([f"- {x}" for x in uc[:5]])
-        else:
-            fact_md += "_No unsupported claims detected._"
 
-        return answer, citations_md, fact_md
-    except requests.RequestException as e:
-        return f"Network error calling {API_BASE}/chat: {e}", "—"
+try:
+    from ui.client import ask_news
+except ImportError:
+    # run as a script (`python ui/app.py`): ui/ itself is on sys.path
+    from client import ask_news
 
 
 with gr.Blocks(title="News RAG Chat") as demo:
@@ -0,0 +1,117 @@
+"""HTTP client behind the Gradio UI: calls the API `/chat` endpoint and
+formats the answer, citations and fact-check panels as markdown.
+
+Kept free of gradio so `ask_news` can be imported (and tested) without
+building the UI.
+"""
+
+import os
+import time
+from itertools import islice
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Optional C-backed JSON parser for API responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# API base used by the UI. Override with the NEWS_API_BASE env var.
+API_BASE = os.getenv("NEWS_API_BASE", "http://localhost:8000")
+
+# How long to wait for a background fact-check before showing it as PENDING
+FACTCHECK_WAIT_S = float(os.getenv("NEWS_FACTCHECK_WAIT", "20"))
+
+# One pooled session for all API calls so keep-alive connections are reused
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def _json_body(resp) -> dict:
+    """Decode a JSON response body; raises ValueError when it is not JSON."""
+    content = getattr(resp, "content", None)
+    if orjson is not None and isinstance(content, bytes):
+        # parse the raw bytes; skips decoding them to text first
+        return orjson.loads(content)
+    return resp.json()
+
+
+def _await_fact_check(request_id: str, fc: dict) -> dict:
+    """Poll `/chat/{request_id}/factcheck` until the verdict is no longer PENDING."""
+    deadline = time.monotonic() + FACTCHECK_WAIT_S
+    while (fc.get("verdict") or "").upper() == "PENDING" and time.monotonic() < deadline:
+        time.sleep(0.5)
+        try:
+            resp = _SESSION.get(f"{API_BASE}/chat/{request_id}/factcheck", timeout=10)
+        except requests.RequestException:
+            break
+        if resp.status_code != 200:
+            break
+        try:
+            fc = _json_body(resp)
+        except ValueError:
+            break
+    return fc
+
+
+def ask_news(question: str) -> tuple[str, str, str]:
+    """Query the backend `/chat` endpoint and return (answer, citations_md, fact_md).
+
+    Returns a tuple of (answer_text, citations_markdown, fact_check_markdown),
+    one per UI output. On errors the answer contains an explanatory message
+    and both markdown panels are the literal "—".
+    """
+    question = (question or "").strip()
+    if not question:
+        return "Please enter a question about the provided news dataset.", "—", "—"
+
+    try:
+        resp = _SESSION.post(f"{API_BASE}/chat", json={"question": question}, timeout=45)
+        if resp.status_code != 200:
+            return f"Error: {resp.status_code} {resp.text}", "—", "—"
+        try:
+            js = _json_body(resp)
+        except ValueError:
+            # Non-JSON response from the API
+            return f"Error: non-JSON response from {API_BASE}/chat", "—", "—"
+
+        answer = js.get("answer", "").strip() or "(no answer)"
+        cits = js.get("citations", []) or []
+        fc = js.get("fact_check") or {}
+        if js.get("request_id"):
+            fc = _await_fact_check(js["request_id"], fc)
+
+        # Build a friendly citations markdown
+        if cits:
+            lines = []
+            for i, c in enumerate(cits, 1):
+                t = c.get("title", "Untitled")
+                u = c.get("link", "#")
+                k = c.get("ticker", "")
+                suffix = f" — {k}" if k else ""
+                lines.append(f"{i}. [{t}]({u}){suffix}")
+            citations_md = "**Sources**\n\n" + "\n".join(lines)
+        else:
+            citations_md = "No sources returned."
+
+        # Fact-check panel
+        verdict = (fc.get("verdict") or "—").upper()
+        conf = fc.get("confidence")
+        notes = fc.get("notes") or ""
+        uc = fc.get("unsupported_claims") or []
+        conf_s = f"{conf:.2f}" if isinstance(conf, (int, float)) else "—"
+
+        fact_md = f"**Fact-check verdict:** `{verdict}`  |  **confidence:** {conf_s}\n\n"
+        if notes:
+            fact_md += f"_Notes:_ {notes}\n\n"
+        if uc:
+            fact_md += "**Unsupported claims:**\n" + "\n".join(f"- {x}" for x in islice(uc, 5))
+        else:
+            fact_md += "_No unsupported claims detected._"
+
+        return answer, citations_md, fact_md
+    except requests.RequestException as e:
+        return f"Network error calling {API_BASE}/chat: {e}", "—", "—"